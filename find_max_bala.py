@@ -2,79 +2,35 @@
 """
 Script to find dates with maximum total Shad Bala
 """
+import dataclasses
+import heapq
+import itertools
+import os
 import sys
 sys.path.insert(0, '.')
-from kundali_maker import kundali, BirthInput
+from concurrent.futures import ProcessPoolExecutor
+import swisseph as swe
+from kundali_maker import kundali_shad_bala, BirthInput, set_ephe_path
 from datetime import datetime, timedelta
+from functools import lru_cache
 import random
 
-def calculate_total_shad_bala(year: int, month: int, day: int, hour: int = 12) -> dict:
-    """Calculate total Shad Bala for a given date."""
-    try:
-        birth_input = BirthInput(
-            year=year, month=month, day=day,
-            hour=hour, minute=0, second=0,
-            tz_offset_hours=0,  # UTC
-            latitude=28.6139,  # Delhi
-            longitude=77.2090,
-            ayanamsha=1,  # Lahiri
-            ephe_path="./ephe"
-        )
-        result = kundali(birth_input)
-        
-        total = 0
-        planet_totals = {}
-        for planet, bala in result['shad_bala'].items():
-            total += bala['total_bala']
-            planet_totals[planet] = bala['total_bala']
-        
-        strong_count = sum(1 for p, b in result['shad_bala'].items() if b['strength'] == 'Strong')
-        
-        return {
-            'date': f"{year}-{month:02d}-{day:02d}",
-            'total': total,
-            'strong_count': strong_count,
-            'planets': planet_totals,
-            'lagna': result['lagna']['sign']
-        }
-    except Exception as e:
-        return None
+set_ephe_path("./ephe")
 
-def search_max_bala():
-    """Search for dates with maximum Shad Bala."""
-    print("Searching for dates with maximum total Shad Bala...")
-    print("=" * 60)
-    
-    best_results = []
-    
-    # Search through various historical dates
-    # Focus on dates where planets might be in strong positions
-    years_to_check = list(range(1900, 2100, 5))  # Every 5 years
-    
-    for year in years_to_check:
-        for month in [1, 4, 7, 10]:  # Quarterly check
-            for day in [1, 15]:
-                result = calculate_total_shad_bala(year, month, day)
-                if result:
-                    best_results.append(result)
-    
-    # Sort by total Shad Bala
-    best_results.sort(key=lambda x: x['total'], reverse=True)
-    
-    print("\nTop 10 Dates with Highest Total Shad Bala:")
-    print("-" * 60)
-    
-    for i, result in enumerate(best_results[:10], 1):
-        print(f"\n{i}. {result['date']} (Lagna: {result['lagna']})")
-        print(f"   Total Shad Bala: {result['total']}")
-        print(f"   Strong Planets: {result['strong_count']}/8")
-        print(f"   Planets: {result['planets']}")
-    
-    # Find theoretical maximum
-    print("\n" + "=" * 60)
-    print("THEORETICAL MAXIMUM SHAD BALA:")
-    print("-" * 60)
-    print("""
+# Number of best dates to report
+TOP_N = 10
+
+# Sweep grid: historical dates every 5 years, quarterly, 1st and 15th, at noon
+SWEEP_YEARS = range(1900, 2100, 5)
+SWEEP_MONTHS = (1, 4, 7, 10)
+SWEEP_DAYS = (1, 15)
+SWEEP_HOURS = (12,)
+
+# Flat (year, month, day, hour) task list, in the same order as the nested loops
+SWEEP_TASKS = tuple(itertools.product(SWEEP_YEARS, SWEEP_MONTHS, SWEEP_DAYS, SWEEP_HOURS))
+
+# Printed after the results
+THEORETICAL_MAX_NOTE = """
 For maximum Shad Bala, all planets would need:
 - Exalted position (+60 Sthana Bala)
 - Moolatrikona position (+45 additional)
@@ -92,15 +48,135 @@ However, this is IMPOSSIBLE because:
 1. Exaltation signs and Dig Bala houses don't overlap for most planets
 2. Inner planets (Sun, Mercury, Venus) don't go retrograde
 3. Planetary positions are constrained by actual orbital mechanics
-""")
+"""
+
+# Fixed location/ayanamsha for the sweep; only the date fields vary per call.
+_TEMPLATE = BirthInput(
+    year=2000, month=1, day=1,
+    hour=12, minute=0, second=0,
+    tz_offset_hours=0,  # UTC
+    latitude=28.6139,  # Delhi
+    longitude=77.2090,
+    ayanamsha=1,  # Lahiri
+    ephe_path="./ephe"
+)
+
+def _shad_bala_chart(year: int, month: int, day: int, hour: int):
+    """Shad Bala chart for a date at the sweep location, or None if it can't be cast."""
+    try:
+        datetime(year, month, day, hour)
+    except ValueError:
+        return None  # Not a real calendar date
+
+    birth_input = dataclasses.replace(_TEMPLATE, year=year, month=month, day=day, hour=hour)
+    try:
+        # Only Shad Bala is needed here; skip charts, Bhava Bala and Dasha.
+        return kundali_shad_bala(birth_input)
+    except (swe.Error, ValueError):
+        return None  # Outside the ephemeris range
+
+def _chart_total(chart: dict) -> float:
+    """Sum of total_shashtiamsas over all bodies in a Shad Bala chart."""
+    total = 0.0
+    for bala in chart['shad_bala'].values():
+        total += bala['total_shashtiamsas']
+    return total
+
+def _summarize(year: int, month: int, day: int, total: float, chart: dict) -> dict:
+    """Build the reported payload (per-planet totals, strong count) for one date."""
+    strong_count = 0
+    planet_totals = {}
+    for planet, bala in chart['shad_bala'].items():
+        planet_totals[planet] = bala['total_shashtiamsas']
+        if bala['strength'] == 'Strong':
+            strong_count += 1
+
+    return {
+        'ymd': (year, month, day),
+        'total': total,
+        'strong_count': strong_count,
+        'planets': planet_totals,
+        'lagna': chart['lagna']['sign']
+    }
+
+@lru_cache(maxsize=8192)
+def calculate_total_shad_bala(year: int, month: int, day: int, hour: int = 12) -> dict:
+    """Calculate total Shad Bala for a given date (cached; treat the result as read-only)."""
+    chart = _shad_bala_chart(year, month, day, hour)
+    if chart is None:
+        return None
+    return _summarize(year, month, day, _chart_total(chart), chart)
+
+def format_date(result: dict) -> str:
+    """YYYY-MM-DD for a sweep result; only done for the dates that get reported."""
+    year, month, day = result['ymd']
+    return f"{year}-{month:02d}-{day:02d}"
+
+def _push_top(heap: list, entry: tuple) -> None:
+    """Offer a (total, -task_index, ...) entry to a size-TOP_N min-heap."""
+    if len(heap) < TOP_N:
+        heapq.heappush(heap, entry)
+    elif entry[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, entry)
+
+def _sweep_chunk(chunk: list) -> list:
+    """
+    Process-pool entry point: best TOP_N dates within a chunk of (index, task) pairs.
+
+    Only the total is computed for every date; the full payload is built just for
+    the chunk's survivors, as (total, -task_index, result) entries.
+    """
+    heap = []
+    for i, (year, month, day, hour) in chunk:
+        chart = _shad_bala_chart(year, month, day, hour)
+        if chart is not None:
+            _push_top(heap, (_chart_total(chart), -i, (year, month, day), chart))
+    return [(total, neg_i, _summarize(*ymd, total, chart)) for total, neg_i, ymd, chart in heap]
+
+def search_max_bala():
+    """Search for dates with maximum Shad Bala."""
+    print("Searching for dates with maximum total Shad Bala...")
+    print("=" * 60)
+    
+    # Each date is an independent, CPU-bound chart computation. Workers sweep
+    # contiguous chunks and return only their local top TOP_N, which are merged
+    # here; ties favour the earlier date.
+    workers = os.cpu_count() or 1
+    size = max(2 * TOP_N, -(-len(SWEEP_TASKS) // workers))
+    indexed = list(enumerate(SWEEP_TASKS))
+    chunks = [indexed[k:k + size] for k in range(0, len(indexed), size)]
+
+    heap = []  # (total, -task_index, result)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for chunk_best in ex.map(_sweep_chunk, chunks):
+            for entry in chunk_best:
+                _push_top(heap, entry)
+
+    # Highest total Shad Bala first
+    best_results = [r for _, _, r in sorted(heap, key=lambda e: e[:2], reverse=True)]
     
+    out = ["\nTop 10 Dates with Highest Total Shad Bala:\n", "-" * 60, "\n"]
+    for i, result in enumerate(best_results, 1):
+        out.append(
+            f"\n{i}. {format_date(result)} (Lagna: {result['lagna']})\n"
+            f"   Total Shad Bala: {result['total']}\n"
+            f"   Strong Planets: {result['strong_count']}/8\n"
+            f"   Planets: {result['planets']}\n"
+        )
+
+    # Find theoretical maximum
+    out += ["\n", "=" * 60, "\nTHEORETICAL MAXIMUM SHAD BALA:\n", "-" * 60, "\n", THEORETICAL_MAX_NOTE, "\n"]
+    sys.stdout.write("".join(out))
+
     return best_results[0] if best_results else None
 
 if __name__ == "__main__":
     best = search_max_bala()
     
     if best:
-        print("\n" + "=" * 60)
-        print(f"BEST DATE FOUND: {best['date']}")
-        print(f"Total Shad Bala: {best['total']}")
-        print("=" * 60)
+        sys.stdout.write(
+            "\n" + "=" * 60 + "\n"
+            f"BEST DATE FOUND: {format_date(best)}\n"
+            f"Total Shad Bala: {best['total']}\n"
+            + "=" * 60 + "\n"
+        )
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import json
 import math
+import pickle
+import threading
+from bisect import bisect_right
 from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Tuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import swisseph as swe
 
@@ -90,12 +95,18 @@ DEBILITATION = {
 COMBUST_ORBS = {
     "Moon": 12,
     "Mars": 17,
-    "Mercury": 14,  # 12 if retrograde
+    "Mercury": 14,  # 12 if retrograde (see COMBUST_ORBS_RETROGRADE)
     "Jupiter": 11,
-    "Venus": 10,    # 8 if retrograde
+    "Venus": 10,    # 8 if retrograde (see COMBUST_ORBS_RETROGRADE)
     "Saturn": 15,
 }
 
+# Tighter combustion orbs that apply while retrograde
+COMBUST_ORBS_RETROGRADE = {
+    "Mercury": 12,
+    "Venus": 8,
+}
+
 # Vimshottari Dasha periods (in years)
 DASHA_PERIODS = {
     "Ketu": 7,
@@ -114,17 +125,149 @@ DASHA_ORDER = [
     "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
 ]
 
+# Sign rulers, indexed by sign (0=Aries .. 11=Pisces)
+SIGN_RULERS = (
+    "Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+    "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter",
+)
+
+# Natural benefic and malefic planets (used by Bhava Bala)
+BENEFICS = frozenset(("Jupiter", "Venus", "Mercury", "Moon"))
+MALEFICS = frozenset(("Sun", "Mars", "Saturn", "Rahu", "Ketu"))
+
+# House groups (1-12) as bitmasks: house h is in a group if (MASK >> h) & 1
+KENDRA_HOUSES_MASK = (1 << 1) | (1 << 4) | (1 << 7) | (1 << 10)
+PANAPARA_HOUSES_MASK = (1 << 2) | (1 << 5) | (1 << 8) | (1 << 11)
+UPACHAYA_HOUSES_MASK = (1 << 3) | (1 << 6) | (1 << 11)  # as used for malefic occupants
+DUSTHANA_HOUSES_MASK = (1 << 6) | (1 << 8) | (1 << 12)
+
+# Position of each lord in DASHA_ORDER, and its period aligned with that order
+DASHA_INDEX = {planet: i for i, planet in enumerate(DASHA_ORDER)}
+DASHA_YEARS = tuple(DASHA_PERIODS[planet] for planet in DASHA_ORDER)
+
 # Total Vimshottari cycle is 120 years
 VIMSHOTTARI_CYCLE = 120
 
 
+# Seconds in a 365.25-day dasha year
+SECONDS_PER_DASHA_YEAR = 365.25 * 24 * 3600
+
+
+def _years_span(years: float) -> timedelta:
+    """Calendar span of a dasha period (365.25-day years)."""
+    return timedelta(days=years * 365.25)
+
+
+def _span_years(span: timedelta) -> float:
+    """Length of `span` in dasha years, as reported in period entries."""
+    return round(span.total_seconds() / SECONDS_PER_DASHA_YEAR, 6)
+
+
+# Full Mahadasha spans, aligned with DASHA_ORDER
+DASHA_SPANS = tuple(_years_span(years) for years in DASHA_YEARS)
+
+
+def _antardasha_sequence(lord: str) -> Tuple[Tuple[str, float, timedelta, float], ...]:
+    """
+    Antardashas of `lord`'s Mahadasha, starting from `lord`.
+
+    Each entry is (planet, years, span, reported_years), where reported_years
+    is the "years" value of an unclipped period of that span.
+    """
+    start = DASHA_INDEX[lord]
+    seq = []
+    for i in range(9):
+        j = (start + i) % 9
+        ant_years = (DASHA_PERIODS[lord] * DASHA_YEARS[j]) / VIMSHOTTARI_CYCLE
+        span = _years_span(ant_years)
+        seq.append((DASHA_ORDER[j], ant_years, span, _span_years(span)))
+    return tuple(seq)
+
+
+ANTARDASHA_TABLE = {lord: _antardasha_sequence(lord) for lord in DASHA_ORDER}
+
+# Each of the 27 nakshatras spans 13°20'
+NAKSHATRA_SPAN = 360 / 27
+
+NAKSHATRAS = (
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashirsha", "Ardra", "Punarvasu",
+    "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra",
+    "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha", "Uttara Ashadha",
+    "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati",
+)
+
+# Navamsa cycle start sign by element (sign_index % 4):
+# Fire -> Aries, Earth -> Capricorn, Air -> Libra, Water -> Cancer
+_NAVAMSA_START = (0, 9, 6, 3)
+
+# Upagrahas in output order, with their chart symbols in the same order
+UPAGRAHA_NAMES = ("Dhuma", "Vyatipata", "Parivesha", "Indrachapa", "Upaketu", "Mandi", "Gulika")
+UPAGRAHA_SYMBOLS = tuple(PLANET_SYMBOLS.get(name, name[:2]) for name in UPAGRAHA_NAMES)
+
+# Saturn's portion (1-8) of the day for Mandi/Gulika, indexed by weekday (0=Sunday)
+# Sunday=8th, Monday=7th, Tuesday=6th, Wednesday=5th, Thursday=4th, Friday=3rd, Saturday=2nd
+SATURN_DAY_PORTIONS = (8, 7, 6, 5, 4, 3, 2)
+# For night births: Sunday=2nd, Monday=1st, Tuesday=7th, etc.
+SATURN_NIGHT_PORTIONS = (2, 1, 7, 6, 5, 4, 3)
+
+
+# Swiss Ephemeris keeps the ephemeris path and sidereal mode as process-wide
+# state, so a chart must be computed start to finish without another thread
+# switching them underneath it.
+_EPHE_LOCK = threading.RLock()
+
+
+# Last path handed to swe.set_ephe_path. Re-setting the path makes Swiss
+# Ephemeris close and re-open its data files, so only do it when it changes.
+_current_ephe_path: Optional[str] = None
+
+
+def set_ephe_path(path: str) -> None:
+    """Point Swiss Ephemeris at `path`, skipping the call if already set."""
+    global _current_ephe_path
+    if path != _current_ephe_path:
+        swe.set_ephe_path(path)
+        if _current_ephe_path is not None:
+            # Positions may come from different ephemeris files now
+            _houses_cached.cache_clear()
+            _calc_planets_cached.cache_clear()
+            _kundali_pickled.cache_clear()
+        _current_ephe_path = path
+
+
+# Last mode handed to swe.set_sid_mode; None until the first chart is prepared.
+_current_sid_mode: Optional[int] = None
+
+
+def set_sid_mode(mode: int) -> None:
+    """Select the sidereal (ayanamsha) mode, skipping the call if already set."""
+    global _current_sid_mode
+    if mode != _current_sid_mode:
+        swe.set_sid_mode(mode, 0, 0)
+        _current_sid_mode = mode
+
+
 def norm_deg(x: float) -> float:
+    # Most inputs (ephemeris output, already-normalized longitudes) are in range
+    if 0.0 < x < 360.0:
+        return x
     x = x % 360.0
     if x < 0:
         x += 360.0
     return x
 
 
+def angular_distance(a: float, b: float) -> float:
+    """Shortest arc between two longitudes, 0..180."""
+    # Same in-range fast path as norm_deg, inlined to skip two calls per pair
+    if not 0.0 < a < 360.0:
+        a = norm_deg(a)
+    if not 0.0 < b < 360.0:
+        b = norm_deg(b)
+    d = abs(a - b)
+    return d if d <= 180.0 else 360.0 - d
+
+
 def calculate_upagrahas(sun_lon: float, jd_ut: float, lat: float, lon: float) -> Dict[str, Dict]:
     """
     Calculate Upagrahas (sub-planets/shadow planets) based on Sun's longitude.
@@ -137,8 +280,6 @@ def calculate_upagrahas(sun_lon: float, jd_ut: float, lat: float, lon: float) ->
     - Upaketu: Indrachapa + 16°40'
     - Mandi/Gulika: Based on Saturn's portion of day/night (requires sunrise calculation)
     """
-    upagrahas = {}
-    
     # Dhuma = Sun + 133°20' (133.333...)
     dhuma_lon = norm_deg(sun_lon + 133.0 + 20.0/60.0)
     
@@ -159,24 +300,18 @@ def calculate_upagrahas(sun_lon: float, jd_ut: float, lat: float, lon: float) ->
     # For simplicity, we use an approximation based on birth time
     weekday = int(jd_ut + 1.5) % 7  # 0=Sunday
     
-    # Saturn's portion order for each weekday (day births)
-    # Sunday=8th, Monday=7th, Tuesday=6th, Wednesday=5th, Thursday=4th, Friday=3rd, Saturday=2nd
-    saturn_day_portions = [8, 7, 6, 5, 4, 3, 2]
-    # For night births: Sunday=2nd, Monday=1st, Tuesday=7th, etc.
-    saturn_night_portions = [2, 1, 7, 6, 5, 4, 3]
-    
     # Get approximate sunrise/sunset (simplified: 6am/6pm)
     # In a full implementation, you'd calculate actual sunrise
     birth_hour = (jd_ut % 1) * 24  # Approximate hour from JD fraction
     is_day = 6 <= birth_hour < 18
     
     if is_day:
-        portion = saturn_day_portions[weekday]
+        portion = SATURN_DAY_PORTIONS[weekday]
         day_length = 12.0  # hours (simplified)
         portion_duration = day_length / 8.0
         mandi_time = 6.0 + (portion - 1) * portion_duration  # Start of Saturn's portion
     else:
-        portion = saturn_night_portions[weekday]
+        portion = SATURN_NIGHT_PORTIONS[weekday]
         night_length = 12.0
         portion_duration = night_length / 8.0
         if birth_hour >= 18:
@@ -193,23 +328,17 @@ def calculate_upagrahas(sun_lon: float, jd_ut: float, lat: float, lon: float) ->
     # Some traditions place Gulika at the start of Saturn's portion, Mandi at the middle
     gulika_lon = norm_deg(mandi_lon - 7.5)  # Slight offset
     
-    # Build upagraha data
-    for name, ulon in [
-        ("Dhuma", dhuma_lon),
-        ("Vyatipata", vyatipata_lon),
-        ("Parivesha", parivesha_lon),
-        ("Indrachapa", indrachapa_lon),
-        ("Upaketu", upaketu_lon),
-        ("Mandi", mandi_lon),
-        ("Gulika", gulika_lon),
-    ]:
-        sign_idx = deg_to_sign_index(ulon)
-        sign_name, d, m, s = deg_to_sign_deg(ulon)
-        navamsa_sign = get_navamsa_sign(ulon)
-        
+    # Build upagraha data in a single pass; each longitude is normalized once
+    # and the navamsa comes from the same sign/degree split.
+    upagrahas = {}
+    for name, symbol, ulon in zip(UPAGRAHA_NAMES, UPAGRAHA_SYMBOLS, (
+        dhuma_lon, vyatipata_lon, parivesha_lon, indrachapa_lon, upaketu_lon, mandi_lon, gulika_lon,
+    )):
+        sign_idx, d, m, s = sign_parts(ulon)
+        navamsa_sign = _navamsa_index(sign_idx, ulon - 30 * sign_idx)
         upagrahas[name] = {
             "longitude": round(ulon, 4),
-            "sign": sign_name,
+            "sign": SIGNS[sign_idx],
             "sign_sanskrit": SIGNS_SANSKRIT[sign_idx],
             "sign_index": sign_idx,
             "navamsa_sign_index": navamsa_sign,
@@ -218,7 +347,7 @@ def calculate_upagrahas(sun_lon: float, jd_ut: float, lat: float, lon: float) ->
             "deg": d,
             "min": m,
             "sec": round(s, 2),
-            "symbol": PLANET_SYMBOLS.get(name, name[:2]),
+            "symbol": symbol,
         }
     
     return upagrahas
@@ -236,35 +365,23 @@ def get_navamsa_sign(longitude: float) -> int:
     - Water signs (Cancer, Scorpio, Pisces): Navamsa cycle starts from Cancer
     """
     lon = norm_deg(longitude)
-    sign_index = int(lon // 30)
-    degree_in_sign = lon % 30
+    return _navamsa_index(int(lon // 30), lon % 30)
+
+
+def _navamsa_index(sign_index: int, degree_in_sign: float) -> int:
+    """Navamsa sign index from an already-split (sign_index, degree_in_sign)."""
     navamsa_pada = int(degree_in_sign / (30.0 / 9.0))  # 0-8, which navamsa within the sign
-    
-    # Determine starting sign based on element
-    element = sign_index % 4  # 0=Fire, 1=Earth, 2=Air, 3=Water
-    if element == 0:  # Fire (Aries, Leo, Sag)
-        start_sign = 0  # Aries
-    elif element == 1:  # Earth (Taurus, Virgo, Cap)
-        start_sign = 9  # Capricorn
-    elif element == 2:  # Air (Gemini, Libra, Aqu)
-        start_sign = 6  # Libra
-    else:  # Water (Cancer, Scorpio, Pisces)
-        start_sign = 3  # Cancer
-    
-    navamsa_sign = (start_sign + navamsa_pada) % 12
-    return navamsa_sign
+    return (_NAVAMSA_START[sign_index & 3] + navamsa_pada) % 12
 
 
 def is_combust(planet_name: str, planet_lon: float, sun_lon: float, is_retrograde: bool) -> bool:
     """Check if planet is combust (too close to Sun)."""
-    if planet_name not in COMBUST_ORBS:
+    orb = COMBUST_ORBS.get(planet_name)
+    if orb is None:
         return False
-    orb = COMBUST_ORBS[planet_name]
-    if planet_name == "Mercury" and is_retrograde:
-        orb = 12
-    elif planet_name == "Venus" and is_retrograde:
-        orb = 8
-    diff = abs(norm_deg(planet_lon - sun_lon))
+    if is_retrograde:
+        orb = COMBUST_ORBS_RETROGRADE.get(planet_name, orb)
+    diff = norm_deg(planet_lon - sun_lon)
     if diff > 180:
         diff = 360 - diff
     return diff <= orb
@@ -275,15 +392,21 @@ def deg_to_sign_index(lon: float) -> int:
     return int(norm_deg(lon) // 30)
 
 
-def deg_to_sign_deg(lon: float) -> Tuple[str, int, int, float]:
-    """Return (sign, deg, min, sec_float) inside sign."""
+def sign_parts(lon: float) -> Tuple[int, int, int, float]:
+    """Return (sign_index, deg, min, sec_float) inside sign, normalizing only once."""
     lon = norm_deg(lon)
-    s = deg_to_sign_index(lon)
+    s = int(lon // 30)
     within = lon - 30 * s
     d = int(within)
     m_float = (within - d) * 60
     m = int(m_float)
     sec = (m_float - m) * 60
+    return s, d, m, sec
+
+
+def deg_to_sign_deg(lon: float) -> Tuple[str, int, int, float]:
+    """Return (sign, deg, min, sec_float) inside sign."""
+    s, d, m, sec = sign_parts(lon)
     return SIGNS[s], d, m, sec
 
 
@@ -313,33 +436,53 @@ class BirthInput:
 # Core Kundali Maker
 # -----------------------------
 
+# Days per month in a common year
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Length of a Gregorian month, without constructing dates."""
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _MONTH_DAYS[month - 1]
+
+
+def _nth_weekday_ordinal(year: int, month: int, weekday: int, n: int) -> int:
+    """Proleptic ordinal of the n-th `weekday` (Mon=0..Sun=6) in a month."""
+    first = date(year, month, 1).toordinal()
+    return first + (weekday - (first + 6) % 7) % 7 + (n - 1) * 7
+
+
+def _last_weekday_ordinal(year: int, month: int, weekday: int) -> int:
+    """Proleptic ordinal of the last `weekday` (Mon=0..Sun=6) in a month."""
+    last = date(year, month, 1).toordinal() + _days_in_month(year, month) - 1
+    return last - ((last + 6) % 7 - weekday) % 7
+
+
+@lru_cache(maxsize=512)
+def _us_dst_bounds(year: int) -> Tuple[int, int]:
+    """US DST [start, end) as date ordinals for `year`."""
+    if year >= 2007:
+        # 2nd Sunday in March -> 1st Sunday in November
+        return _nth_weekday_ordinal(year, 3, 6, 2), _nth_weekday_ordinal(year, 11, 6, 1)
+    if 1987 <= year <= 2006:
+        # 1st Sunday in April -> last Sunday in October
+        return _nth_weekday_ordinal(year, 4, 6, 1), _last_weekday_ordinal(year, 10, 6)
+    # Before 1987: last Sunday in April -> last Sunday in October
+    return _last_weekday_ordinal(year, 4, 6), _last_weekday_ordinal(year, 10, 6)
+
+
+@lru_cache(maxsize=512)
+def _eu_dst_bounds(year: int) -> Tuple[int, int]:
+    """European DST [start, end) as date ordinals: last Sunday in March -> last Sunday in October."""
+    return _last_weekday_ordinal(year, 3, 6), _last_weekday_ordinal(year, 10, 6)
+
+
 def is_dst_observed(year: int, month: int, day: int, latitude: float, longitude: float, base_tz_offset: float) -> bool:
     """
     Determine if DST was likely observed on the given date based on location and timezone.
     Returns True if DST adjustment should be applied.
     """
-    def nth_weekday_of_month(year_: int, month_: int, weekday: int, n: int) -> int:
-        """Return day-of-month for the n-th `weekday` (Mon=0..Sun=6) in a month."""
-        first = datetime(year_, month_, 1)
-        first_wd = first.weekday()
-        delta = (weekday - first_wd) % 7
-        return 1 + delta + (n - 1) * 7
-
-    def last_weekday_of_month(year_: int, month_: int, weekday: int) -> int:
-        """Return day-of-month for the last `weekday` (Mon=0..Sun=6) in a month."""
-        if month_ == 12:
-            next_month = datetime(year_ + 1, 1, 1)
-        else:
-            next_month = datetime(year_, month_ + 1, 1)
-        last_day = (next_month - timedelta(days=1)).day
-        last = datetime(year_, month_, last_day)
-        last_wd = last.weekday()
-        delta = (last_wd - weekday) % 7
-        return last_day - delta
-
-    def date_tuple(y: int, m: int, d: int) -> tuple[int, int, int]:
-        return (y, m, d)
-
     # Simple DST detection for common regions
     # Note: This is a simplified approach - for production, consider using a proper timezone library
     
@@ -347,39 +490,13 @@ def is_dst_observed(year: int, month: int, day: int, latitude: float, longitude:
     if -125 <= longitude <= -65 and 25 <= latitude <= 49:  # Continental US bounds
         # We evaluate by date only (no time-of-day). On the exact transition Sundays,
         # times before/after 2:00 AM local can differ by 1 hour.
-        cur = date_tuple(year, month, day)
-
-        if year >= 2007:
-            # 2nd Sunday in March -> 1st Sunday in November
-            start_day = nth_weekday_of_month(year, 3, weekday=6, n=2)  # Sunday
-            end_day = nth_weekday_of_month(year, 11, weekday=6, n=1)   # Sunday
-            start = date_tuple(year, 3, start_day)
-            end = date_tuple(year, 11, end_day)
-            return start <= cur < end
-
-        if 1987 <= year <= 2006:
-            # 1st Sunday in April -> last Sunday in October
-            start_day = nth_weekday_of_month(year, 4, weekday=6, n=1)
-            end_day = last_weekday_of_month(year, 10, weekday=6)
-            start = date_tuple(year, 4, start_day)
-            end = date_tuple(year, 10, end_day)
-            return start <= cur < end
-
-        # Before 1987: last Sunday in April -> last Sunday in October
-        start_day = last_weekday_of_month(year, 4, weekday=6)
-        end_day = last_weekday_of_month(year, 10, weekday=6)
-        start = date_tuple(year, 4, start_day)
-        end = date_tuple(year, 10, end_day)
-        return start <= cur < end
+        start, end = _us_dst_bounds(year)
+        return start <= date(year, month, 1).toordinal() + day - 1 < end
     
     # Europe DST detection (UK, Germany, etc.)
     if -10 <= longitude <= 40 and 35 <= latitude <= 70:  # European bounds
-        cur = date_tuple(year, month, day)
-        start_day = last_weekday_of_month(year, 3, weekday=6)  # last Sunday in March
-        end_day = last_weekday_of_month(year, 10, weekday=6)   # last Sunday in October
-        start = date_tuple(year, 3, start_day)
-        end = date_tuple(year, 10, end_day)
-        return start <= cur < end
+        start, end = _eu_dst_bounds(year)
+        return start <= date(year, month, 1).toordinal() + day - 1 < end
     
     # Canada (similar to US)
     if -140 <= longitude <= -50 and 40 <= latitude <= 70:  # Canadian bounds
@@ -407,6 +524,31 @@ def is_dst_observed(year: int, month: int, day: int, latitude: float, longitude:
     return False
 
 
+# US standard offsets by longitude band: Pacific, Mountain, Central, Eastern, Atlantic.
+# A longitude exactly on a break belongs to the band east of it.
+_US_TZ_LON_BREAKS = (-105, -90, -82, -67)
+_US_STANDARD_TZ = (-8.0, -7.0, -6.0, -5.0, -4.0)
+
+# (lat_lo, lat_hi, lon_lo, lon_hi, standard offset), checked in order after the US
+_STANDARD_TZ_REGIONS = (
+    (8, 37, 68, 97, 5.5),     # India
+    (49, 61, -11, 2, 0.0),    # UK/Ireland
+    (35, 71, -10, 17, 1.0),   # Western Europe (CET)
+    (35, 71, 17, 40, 2.0),    # Eastern Europe (EET)
+)
+
+# Regions that don't observe DST: (lat_lo, lat_hi, lon_lo, lon_hi, snap offset or None),
+# checked in order
+_NO_DST_REGIONS = (
+    (6, 38, 68, 98, 5.5),       # India: IST (UTC+5:30)
+    (26, 31, 80, 89, 5.75),     # Nepal: UTC+5:45
+    (0, 55, 97, 145, None),     # China, Japan, Korea, Southeast Asia
+    (12, 42, 34, 63, None),     # Middle East (UAE, Saudi, etc.)
+    (41, 82, 27, 180, None),    # Russia - no DST since 2014
+)
+
+
+@lru_cache(maxsize=4096, typed=True)
 def get_standard_tz_offset(latitude: float, longitude: float) -> float:
     """
     Get the standard (non-DST) timezone offset for a location.
@@ -414,37 +556,17 @@ def get_standard_tz_offset(latitude: float, longitude: float) -> float:
     """
     # US timezone boundaries (approximate)
     if 25 <= latitude <= 49 and -125 <= longitude <= -65:
-        if longitude >= -67:  # Atlantic (rare in continental US)
-            return -4.0
-        elif longitude >= -82:  # Eastern
-            return -5.0
-        elif longitude >= -90:  # Central (approximate boundary)
-            return -6.0
-        elif longitude >= -105:  # Mountain (approximate boundary)
-            return -7.0
-        else:  # Pacific
-            return -8.0
-    
-    # India
-    if 8 <= latitude <= 37 and 68 <= longitude <= 97:
-        return 5.5
-    
-    # UK/Ireland
-    if 49 <= latitude <= 61 and -11 <= longitude <= 2:
-        return 0.0
-    
-    # Western Europe (CET)
-    if 35 <= latitude <= 71 and -10 <= longitude <= 17:
-        return 1.0
+        return _US_STANDARD_TZ[bisect_right(_US_TZ_LON_BREAKS, longitude)]
     
-    # Eastern Europe (EET)
-    if 35 <= latitude <= 71 and 17 <= longitude <= 40:
-        return 2.0
+    for lat_lo, lat_hi, lon_lo, lon_hi, offset in _STANDARD_TZ_REGIONS:
+        if lat_lo <= latitude <= lat_hi and lon_lo <= longitude <= lon_hi:
+            return offset
     
     # Default: use longitude-based approximation
     return round(longitude / 15.0)
 
 
+@lru_cache(maxsize=4096, typed=True)
 def adjust_for_dst(year: int, month: int, day: int, latitude: float, longitude: float, base_tz_offset: float) -> float:
     """
     Adjust timezone offset for DST if applicable.
@@ -453,31 +575,16 @@ def adjust_for_dst(year: int, month: int, day: int, latitude: float, longitude:
     Strategy:
     1. For regions without DST (India, China, etc.), trust the user's input
     2. For DST regions (US, Europe), normalize based on location and date
-    """
-    # India: IST (UTC+5:30), no DST - trust user input if it's 5.5
-    if 6 <= latitude <= 38 and 68 <= longitude <= 98:
-        # User likely entered IST, trust it
-        if abs(base_tz_offset - 5.5) < 0.1:
-            return 5.5
-        return base_tz_offset
-    
-    # Nepal: UTC+5:45, no DST
-    if 26 <= latitude <= 31 and 80 <= longitude <= 89:
-        if abs(base_tz_offset - 5.75) < 0.1:
-            return 5.75
-        return base_tz_offset
-    
-    # China, Japan, Korea, Southeast Asia - no DST, trust user input
-    if 0 <= latitude <= 55 and 97 <= longitude <= 145:
-        return base_tz_offset
-    
-    # Middle East (UAE, Saudi, etc.) - no DST
-    if 12 <= latitude <= 42 and 34 <= longitude <= 63:
-        return base_tz_offset
     
-    # Russia - no DST since 2014
-    if 41 <= latitude <= 82 and 27 <= longitude <= 180:
-        return base_tz_offset
+    Memoized on the exact arguments; see clear_dst_cache().
+    """
+    # Regions without DST: trust the user's input (snapped to the local
+    # standard offset when it is already within 0.1h of it)
+    for lat_lo, lat_hi, lon_lo, lon_hi, snap_offset in _NO_DST_REGIONS:
+        if lat_lo <= latitude <= lat_hi and lon_lo <= longitude <= lon_hi:
+            if snap_offset is not None and abs(base_tz_offset - snap_offset) < 0.1:
+                return snap_offset
+            return base_tz_offset
     
     # For DST regions, normalize the timezone
     standard_tz = get_standard_tz_offset(latitude, longitude)
@@ -501,6 +608,33 @@ def adjust_for_dst(year: int, month: int, day: int, latitude: float, longitude:
         return standard_tz
 
 
+def _split_days(hours: float) -> Tuple[int, float]:
+    """Split decimal hours into (whole-day shift, hours within [0, 24))."""
+    days, hours = divmod(hours, 24.0)
+    if hours >= 24.0:  # divmod rounds a tiny negative up to exactly 24.0
+        days += 1
+        hours -= 24.0
+    return int(days), hours
+
+
+def _shift_days(year: int, month: int, day: int, days: int) -> Tuple[int, int, int]:
+    """Move a calendar date by a whole number of days using proleptic ordinals."""
+    if not days:
+        return year, month, day
+    shifted = date.fromordinal(date(year, month, day).toordinal() + days)
+    return shifted.year, shifted.month, shifted.day
+
+
+def clear_dst_cache() -> None:
+    """Drop memoized timezone/DST results (e.g. after changing the region rules)."""
+    get_standard_tz_offset.cache_clear()
+    adjust_for_dst.cache_clear()
+    _us_dst_bounds.cache_clear()
+    _eu_dst_bounds.cache_clear()
+    _ist_conversion.cache_clear()
+    _kundali_pickled.cache_clear()
+
+
 def convert_to_ist(
     year: int, month: int, day: int, hour: int, minute: int, second: int,
     tz_offset: float, latitude: float, longitude: float
@@ -515,6 +649,18 @@ def convert_to_ist(
     
     Returns dict with IST year, month, day, hour, minute, second and the effective offset used.
     """
+    return dict(_ist_conversion(year, month, day, hour, minute, second, tz_offset, latitude, longitude))
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _ist_conversion(
+    year: int, month: int, day: int, hour: int, minute: int, second: int,
+    tz_offset: float, latitude: float, longitude: float
+) -> Tuple[Tuple[str, object], ...]:
+    """
+    Memoized convert_to_ist result as (key, value) pairs, so each caller gets
+    a fresh dict. Cleared by clear_dst_cache().
+    """
     IST_OFFSET = 5.5
     
     # Step 1: Adjust for DST at source location
@@ -528,15 +674,8 @@ def convert_to_ist(
     utc_y, utc_m, utc_d = year, month, day
     
     # Handle day rollover for UTC
-    while utc_decimal_hours < 0:
-        utc_decimal_hours += 24
-        dt = datetime(utc_y, utc_m, utc_d, tzinfo=timezone.utc) - timedelta(days=1)
-        utc_y, utc_m, utc_d = dt.year, dt.month, dt.day
-
-    while utc_decimal_hours >= 24:
-        utc_decimal_hours -= 24
-        dt = datetime(utc_y, utc_m, utc_d, tzinfo=timezone.utc) + timedelta(days=1)
-        utc_y, utc_m, utc_d = dt.year, dt.month, dt.day
+    shift, utc_decimal_hours = _split_days(utc_decimal_hours)
+    utc_y, utc_m, utc_d = _shift_days(utc_y, utc_m, utc_d, shift)
 
     utc_hour = int(utc_decimal_hours)
     utc_minute = int((utc_decimal_hours - utc_hour) * 60)
@@ -547,21 +686,14 @@ def convert_to_ist(
     ist_y, ist_m, ist_d = utc_y, utc_m, utc_d
 
     # Handle day rollover for IST
-    while ist_decimal_hours < 0:
-        ist_decimal_hours += 24
-        dt = datetime(ist_y, ist_m, ist_d, tzinfo=timezone.utc) - timedelta(days=1)
-        ist_y, ist_m, ist_d = dt.year, dt.month, dt.day
-
-    while ist_decimal_hours >= 24:
-        ist_decimal_hours -= 24
-        dt = datetime(ist_y, ist_m, ist_d, tzinfo=timezone.utc) + timedelta(days=1)
-        ist_y, ist_m, ist_d = dt.year, dt.month, dt.day
+    shift, ist_decimal_hours = _split_days(ist_decimal_hours)
+    ist_y, ist_m, ist_d = _shift_days(ist_y, ist_m, ist_d, shift)
     
     ist_hour = int(ist_decimal_hours)
     ist_minute = int((ist_decimal_hours - ist_hour) * 60)
     ist_second = int(((ist_decimal_hours - ist_hour) * 60 - ist_minute) * 60)
     
-    return {
+    return tuple({
         "year": ist_y,
         "month": ist_m,
         "day": ist_d,
@@ -578,7 +710,7 @@ def convert_to_ist(
         "utc_hour": utc_hour,
         "utc_minute": utc_minute,
         "utc_second": utc_second,
-    }
+    }.items())
 
 
 def compute_julian_day_local(b: BirthInput, adjusted_tz_offset: float = None) -> float:
@@ -603,22 +735,35 @@ def compute_julian_day_local(b: BirthInput, adjusted_tz_offset: float = None) ->
         ut_decimal_hours = local_decimal_hours - tz_to_use
         y, m, d = b.year, b.month, b.day
 
-    while ut_decimal_hours < 0:
-        ut_decimal_hours += 24
-        dt = datetime(y, m, d)
-        dt2 = dt.replace(tzinfo=timezone.utc)
-        dt_prev = dt2.timestamp() - 86400
-        prev = datetime.fromtimestamp(dt_prev, tz=timezone.utc)
-        y, m, d = prev.year, prev.month, prev.day
+    return _julday_ut(y, m, d, ut_decimal_hours)
+
+
+def _julday_ut(y: int, m: int, d: int, ut_decimal_hours: float) -> float:
+    """Julian day for a UT date and decimal hours, rolling the date over as needed."""
+    shift, ut_decimal_hours = _split_days(ut_decimal_hours)
+    y, m, d = _shift_days(y, m, d, shift)
+
+    return swe.julday(y, m, d, ut_decimal_hours)
 
-    while ut_decimal_hours >= 24:
-        ut_decimal_hours -= 24
-        dt = datetime(y, m, d, tzinfo=timezone.utc).timestamp() + 86400
-        nxt = datetime.fromtimestamp(dt, tz=timezone.utc)
-        y, m, d = nxt.year, nxt.month, nxt.day
 
-    jd_ut = swe.julday(y, m, d, ut_decimal_hours)
-    return jd_ut
+def make_jd_converter(
+    tz_offset: float, latitude: float, longitude: float, use_utc: bool = False
+) -> Callable[[int, int, int, int, int, int], float]:
+    """
+    Build a (year, month, day, hour, minute, second) -> UT Julian day function for one place.
+
+    Equivalent to compute_julian_day_local() for a BirthInput with these fields,
+    but with the place and use_utc fixed up front, so sweeps over many instants
+    (transit or dasha tables) skip building a BirthInput and re-branching per call.
+    """
+    if use_utc:
+        def to_jd(year: int, month: int, day: int, hour: int, minute: int, second: int) -> float:
+            return _julday_ut(year, month, day, hour + minute / 60 + second / 3600)
+    else:
+        def to_jd(year: int, month: int, day: int, hour: int, minute: int, second: int) -> float:
+            tz = adjust_for_dst(year, month, day, latitude, longitude, tz_offset)
+            return _julday_ut(year, month, day, hour + minute / 60 + second / 3600 - tz)
+    return to_jd
 
 
 def local_to_utc(year: int, month: int, day: int, hour: int, minute: int, second: int, tz_offset: float) -> dict:
@@ -631,15 +776,8 @@ def local_to_utc(year: int, month: int, day: int, hour: int, minute: int, second
     
     y, m, d = year, month, day
     
-    while ut_decimal_hours < 0:
-        ut_decimal_hours += 24
-        dt = datetime(y, m, d, tzinfo=timezone.utc) - timedelta(days=1)
-        y, m, d = dt.year, dt.month, dt.day
-    
-    while ut_decimal_hours >= 24:
-        ut_decimal_hours -= 24
-        dt = datetime(y, m, d, tzinfo=timezone.utc) + timedelta(days=1)
-        y, m, d = dt.year, dt.month, dt.day
+    shift, ut_decimal_hours = _split_days(ut_decimal_hours)
+    y, m, d = _shift_days(y, m, d, shift)
     
     ut_hour = int(ut_decimal_hours)
     ut_minute = int((ut_decimal_hours - ut_hour) * 60)
@@ -665,15 +803,8 @@ def utc_to_local(year: int, month: int, day: int, hour: int, minute: int, second
     
     y, m, d = year, month, day
     
-    while local_decimal_hours < 0:
-        local_decimal_hours += 24
-        dt = datetime(y, m, d, tzinfo=timezone.utc) - timedelta(days=1)
-        y, m, d = dt.year, dt.month, dt.day
-    
-    while local_decimal_hours >= 24:
-        local_decimal_hours -= 24
-        dt = datetime(y, m, d, tzinfo=timezone.utc) + timedelta(days=1)
-        y, m, d = dt.year, dt.month, dt.day
+    shift, local_decimal_hours = _split_days(local_decimal_hours)
+    y, m, d = _shift_days(y, m, d, shift)
     
     local_hour = int(local_decimal_hours)
     local_minute = int((local_decimal_hours - local_hour) * 60)
@@ -689,15 +820,137 @@ def utc_to_local(year: int, month: int, day: int, hour: int, minute: int, second
     }
 
 
+@lru_cache(maxsize=8192)
+def _houses_cached(jd_ut: float, lat: float, lon: float, hsys: bytes) -> tuple:
+    """Memoized swe.houses_ex (tropical, so independent of the sidereal mode)."""
+    return swe.houses_ex(jd_ut, lat, lon, hsys)
+
+
+# Sidereal positions with speed, as used for every chart planet
+PLANET_CALC_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+
+# Swiss Ephemeris ids in PLANETS order
+PLANET_IDS = tuple(PLANETS.values())
+
+# Per-body constants for _compute_planets, in PLANETS order followed by Ketu:
+# (name, symbol, exaltation sign, debilitation sign)
+PLANET_STATIC = tuple(
+    (name, PLANET_SYMBOLS[name], EXALTATION.get(name), DEBILITATION.get(name))
+    for name in (*PLANETS, "Ketu")
+)
+_RAHU_ROW = list(PLANETS).index("Rahu")
+
+
+@lru_cache(maxsize=1024)
+def _calc_planets_cached(jd_ut: float, sid_mode: int) -> Tuple[Tuple[float, ...], ...]:
+    """
+    Memoized swe.calc_ut coordinates for all PLANETS at `jd_ut`, in PLANETS order.
+
+    `sid_mode` is not passed to Swiss Ephemeris; it is part of the key because
+    FLG_SIDEREAL results depend on the mode set by set_sid_mode().
+    """
+    calc_ut = swe.calc_ut
+    flags = PLANET_CALC_FLAGS
+    return tuple(calc_ut(jd_ut, p, flags)[0] for p in PLANET_IDS)
+
+
+def compute_positions_batch(
+    jds: Sequence[float], planet_ids: Sequence[int], flags: int
+) -> List[List[Tuple[float, ...]]]:
+    """
+    Swiss Ephemeris positions for many instants in one call.
+
+    Returns result[i][j] = swe.calc_ut(jds[i], planet_ids[j], flags) coordinates.
+    Instants are evaluated in time order, which keeps ephemeris-file reads local,
+    and returned in input order. The caller sets the sidereal mode beforehand.
+    Runs serially: Swiss Ephemeris keeps global state (sidereal mode, open files)
+    and is not thread-safe.
+    """
+    calc_ut = swe.calc_ut
+    out: List[List[Tuple[float, ...]]] = [[] for _ in jds]
+    for i in sorted(range(len(jds)), key=jds.__getitem__):
+        jd = jds[i]
+        out[i] = [calc_ut(jd, pid, flags)[0] for pid in planet_ids]
+    return out
+
+
 def compute_lagna(jd_ut: float, lat: float, lon: float) -> float:
     """
     Compute Ascendant longitude (tropical) using Swiss Ephemeris houses.
     """
-    cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'P')
+    cusps, ascmc = _houses_cached(jd_ut, lat, lon, b'P')
     asc_tropical = ascmc[0]
     return asc_tropical
 
 
+def planet_columns(planets_out: Dict[str, Dict]) -> Dict[str, tuple]:
+    """
+    Column (struct-of-arrays) view of planets_out, in planets_out order.
+
+    Returns parallel tuples under "name", "longitude", "speed", "retrograde"
+    and "house", with values already coerced (and defaulted as the Bala code
+    expects), so hot loops can iterate plain values instead of re-reading
+    and converting each planet dict.
+    """
+    names = tuple(planets_out)
+    rows = tuple(planets_out[p] for p in names)
+    return {
+        "name": names,
+        "longitude": tuple(float(r.get("longitude", 0.0)) for r in rows),
+        "speed": tuple(float(r.get("speed", 0.0)) for r in rows),
+        "retrograde": tuple(bool(r.get("retrograde", False)) for r in rows),
+        "house": tuple(int(r.get("house_whole_sign", 1)) for r in rows),
+    }
+
+
+def _bhava_aspect_value(angle: float, _abs=abs) -> float:
+    """Bhava Drishti aspect value for an angle (exact-window aspects only)."""
+    angle = _abs(angle)
+    if angle > 180:
+        angle = 360 - angle
+
+    if 175 <= angle <= 185:  # Opposition
+        return 60.0
+    elif 115 <= angle <= 125:  # Trine
+        return 30.0
+    elif 85 <= angle <= 95:  # Square
+        return 45.0
+    elif 55 <= angle <= 65:  # Sextile
+        return 15.0
+    return 0.0
+
+
+def _bhava_digbala(house_num: int) -> float:
+    """
+    Directional strength of the house.
+    Kendras (1,4,7,10) are strongest, then Panaparas (2,5,8,11), then Apoklimas (3,6,9,12).
+    Also adds special significance for certain houses.
+    """
+    # More conservative base values in Shashtiamsas
+    if (KENDRA_HOUSES_MASK >> house_num) & 1:  # Kendras
+        base = 45.0
+    elif (PANAPARA_HOUSES_MASK >> house_num) & 1:  # Panaparas
+        base = 30.0
+    else:  # Apoklimas (3, 6, 9, 12)
+        base = 18.0
+
+    # Smaller bonuses for key houses
+    if house_num == 1:
+        base += 6.0
+    elif house_num == 10:
+        base += 5.0
+    elif house_num == 9:
+        base += 4.0
+    elif house_num in (5, 11):
+        base += 3.0
+
+    return base
+
+
+# Bhava Digbala only depends on the house number, indexed by house (1-12)
+BHAVA_DIGBALA = tuple(_bhava_digbala(house) for house in range(13))
+
+
 def calculate_bhava_bala(
     planets_out: Dict,
     lagna_sign: int,
@@ -716,111 +969,63 @@ def calculate_bhava_bala(
     """
     bhava_bala = {}
     
-    # Sign rulers
-    SIGN_RULERS = {
-        0: "Mars", 1: "Venus", 2: "Mercury", 3: "Moon",
-        4: "Sun", 5: "Mercury", 6: "Venus", 7: "Mars",
-        8: "Jupiter", 9: "Saturn", 10: "Saturn", 11: "Jupiter"
+    # Per-chart inputs, coerced once rather than per house / occupant
+    columns = planet_columns(planets_out)
+    planet_lons = dict(zip(columns["name"], columns["longitude"]))
+    shad_totals = {
+        name: float(bala.get("total_shashtiamsas", 300.0)) for name, bala in shad_bala.items()
+    }
+
+    # Planets whose aspects count towards Bhava Drishti Bala, resolved once per
+    # chart rather than per house: (longitude, is_benefic). Ketu is excluded and
+    # planets that are neither benefic nor malefic never contribute.
+    aspecting_planets: List[Tuple[float, bool]] = []
+    for planet_name, planet_lon in zip(columns["name"], columns["longitude"]):
+        if planet_name == "Ketu":
+            continue
+        if planet_name in BENEFICS:
+            aspecting_planets.append((planet_lon, True))
+        elif planet_name in MALEFICS:
+            aspecting_planets.append((planet_lon, False))
+    
+    # Occupants of each sign without the Ascendant marker, and each planet's
+    # (house, sign) for the lord lookup, built once instead of per house
+    occupants_by_sign = {
+        sign: [p for p in planets if p != "Asc"] for sign, planets in rasi_chart.items()
+    }
+    lord_positions = {
+        name: (((data.get("sign_index", 0) - lagna_sign) % 12) + 1, data.get("sign", ""))
+        for name, data in planets_out.items()
     }
     
-    # Benefic and malefic planets
-    BENEFICS = ("Jupiter", "Venus", "Mercury", "Moon")
-    MALEFICS = ("Sun", "Mars", "Saturn", "Rahu", "Ketu")
-    
-    def normalize(deg: float) -> float:
-        d = deg % 360.0
-        return d if d >= 0 else d + 360.0
-    
-    def angular_distance(a: float, b: float) -> float:
-        d = abs(normalize(a) - normalize(b))
-        return min(d, 360.0 - d)
-    
-    def get_house_lord(house_num: int) -> str:
-        """Get the lord of a house based on lagna sign."""
-        house_sign = (lagna_sign + house_num - 1) % 12
-        return SIGN_RULERS.get(house_sign, "")
-    
-    def get_house_midpoint(house_num: int) -> float:
-        """Get the midpoint longitude of a house (whole sign)."""
-        house_sign = (lagna_sign + house_num - 1) % 12
-        return normalize(house_sign * 30 + 15)
-    
-    def get_aspect_value(angle: float) -> float:
-        """Get aspect value based on angle."""
-        angle = abs(angle)
-        if angle > 180:
-            angle = 360 - angle
-        
-        if 175 <= angle <= 185:  # Opposition
-            return 60.0
-        elif 115 <= angle <= 125:  # Trine
-            return 30.0
-        elif 85 <= angle <= 95:  # Square
-            return 45.0
-        elif 55 <= angle <= 65:  # Sextile
-            return 15.0
-        return 0.0
-    
-    def bhavadhipati_bala(house_num: int) -> float:
+    def bhavadhipati_bala(lord: str) -> float:
         """
         Strength derived from the house lord's Shad Bala.
         The stronger the lord, the stronger the house.
         """
-        lord = get_house_lord(house_num)
-        if lord in shad_bala:
+        if lord in shad_totals:
             # Use natural (uncapped) Shad Bala totals. Map typical 300-600 virupa
             # into a stable 20-60 virupa contribution for Bhava Bala.
-            lord_total = float(shad_bala[lord].get("total_shashtiamsas", 300.0))
+            lord_total = shad_totals[lord]
             return min(60.0, max(20.0, lord_total / 10.0))
         return 35.0
     
-    def bhava_digbala(house_num: int) -> float:
-        """
-        Directional strength of the house.
-        Kendras (1,4,7,10) are strongest, then Panaparas (2,5,8,11), then Apoklimas (3,6,9,12).
-        Also adds special significance for certain houses.
-        """
-        # More conservative base values in Shashtiamsas
-        if house_num in (1, 4, 7, 10):  # Kendras
-            base = 45.0
-        elif house_num in (2, 5, 8, 11):  # Panaparas
-            base = 30.0
-        else:  # Apoklimas (3, 6, 9, 12)
-            base = 18.0
-
-        # Smaller bonuses for key houses
-        if house_num == 1:
-            base += 6.0
-        elif house_num == 10:
-            base += 5.0
-        elif house_num == 9:
-            base += 4.0
-        elif house_num in (5, 11):
-            base += 3.0
-
-        return base
-    
-    def bhava_drishti_bala(house_num: int) -> float:
+    def bhava_drishti_bala(house_midpoint: float) -> float:
         """
         Aspectual strength on the house.
         Benefic aspects add strength, malefic aspects reduce it.
         """
         DRIK_CAP_LOCAL = 60.0
-        house_midpoint = get_house_midpoint(house_num)
+        aspect_value_of = _bhava_aspect_value
+        distance = angular_distance
         total = 0.0
         
-        for planet_name, planet_data in planets_out.items():
-            if planet_name == "Ketu":
-                continue
-            
-            planet_lon = float(planet_data.get("longitude", 0.0))
-            angle = angular_distance(planet_lon, house_midpoint)
-            aspect_value = get_aspect_value(angle)
-            
+        for planet_lon, is_benefic in aspecting_planets:
+            aspect_value = aspect_value_of(distance(planet_lon, house_midpoint))
             if aspect_value > 0:
-                if planet_name in BENEFICS:
+                if is_benefic:
                     total += aspect_value / 4
-                elif planet_name in MALEFICS:
+                else:
                     total -= aspect_value / 4
         
         # Cap Drik Bala to avoid extreme stacking in simplified aspect model
@@ -830,22 +1035,17 @@ def calculate_bhava_bala(
             return -DRIK_CAP_LOCAL
         return total
     
-    def bhava_residential_strength(house_num: int) -> float:
+    def bhava_residential_strength(house_midpoint: float, planets_in_house: List[str]) -> float:
         """
         Strength based on planets' position within the house.
         Planets closer to house midpoint give more strength.
         """
-        house_midpoint = get_house_midpoint(house_num)
-        house_sign = (lagna_sign + house_num - 1) % 12
-        planets_in_house = rasi_chart.get(house_sign, [])
-        
         total = 0.0
         for planet in planets_in_house:
-            if planet == "Asc" or planet not in planets_out:
+            if planet not in planet_lons:
                 continue
             
-            planet_data = planets_out[planet]
-            planet_lon = float(planet_data.get("longitude", 0.0))
+            planet_lon = planet_lons[planet]
             
             # Distance from house midpoint (0-15 degrees)
             dist = angular_distance(planet_lon, house_midpoint)
@@ -863,20 +1063,17 @@ def calculate_bhava_bala(
         
         return min(60.0, total)
     
-    def planet_contribution(house_num: int) -> float:
+    def planet_contribution(house_num: int, planets_in_house: List[str]) -> float:
         """
         Additional strength from planets occupying the house.
         Based on their individual Shad Bala.
         """
-        house_sign = (lagna_sign + house_num - 1) % 12
-        planets_in_house = rasi_chart.get(house_sign, [])
-        
         total = 0.0
         for planet in planets_in_house:
-            if planet == "Asc" or planet not in shad_bala:
+            if planet not in shad_totals:
                 continue
             
-            planet_total = float(shad_bala[planet].get("total_shashtiamsas", 300.0))
+            planet_total = shad_totals[planet]
             # Keep occupant contribution meaningful but bounded
             contribution = min(30.0, max(0.0, planet_total / 20.0))
 
@@ -885,9 +1082,9 @@ def calculate_bhava_bala(
                 total += contribution
             # Malefics can reduce or add depending on house
             elif planet in MALEFICS:
-                if house_num in (3, 6, 11):  # Upachaya houses - malefics can help
+                if (UPACHAYA_HOUSES_MASK >> house_num) & 1:  # Upachaya houses - malefics can help
                     total += contribution * 0.7
-                elif house_num in (6, 8, 12):  # Dusthana houses - malefics reduce
+                elif (DUSTHANA_HOUSES_MASK >> house_num) & 1:  # Dusthana houses - malefics reduce
                     total -= contribution * 0.4
                 else:
                     total += contribution * 0.45
@@ -896,15 +1093,16 @@ def calculate_bhava_bala(
     
     for house in range(1, 13):
         house_sign = (lagna_sign + house - 1) % 12
-        planets_in_house = rasi_chart.get(house_sign, [])
-        lord = get_house_lord(house)
+        planets_in_house = occupants_by_sign.get(house_sign, [])
+        lord = SIGN_RULERS[house_sign]
+        house_midpoint = house_sign * 30 + 15.0  # whole sign, already within 15..345
         
         # Calculate all components
-        adhipati = bhavadhipati_bala(house)
-        digbala = bhava_digbala(house)
-        drishti = bhava_drishti_bala(house)
-        residential = bhava_residential_strength(house)
-        planet_contrib = planet_contribution(house)
+        adhipati = bhavadhipati_bala(lord)
+        digbala = BHAVA_DIGBALA[house]
+        drishti = bhava_drishti_bala(house_midpoint)
+        residential = bhava_residential_strength(house_midpoint, planets_in_house)
+        planet_contrib = planet_contribution(house, planets_in_house)
         
         # Total Bhava Bala in Shashtiamsas
         total_shashtiamsas = adhipati + digbala + drishti + residential + planet_contrib
@@ -928,12 +1126,7 @@ def calculate_bhava_bala(
             rating = "Weak"
         
         # Get lord's position
-        lord_house = 0
-        lord_sign = ""
-        if lord in planets_out:
-            lord_sign_idx = planets_out[lord].get("sign_index", 0)
-            lord_house = ((lord_sign_idx - lagna_sign) % 12) + 1
-            lord_sign = planets_out[lord].get("sign", "")
+        lord_house, lord_sign = lord_positions.get(lord, (0, ""))
         
         bhava_bala[house] = {
             "house": house,
@@ -942,9 +1135,9 @@ def calculate_bhava_bala(
             "lord": lord,
             "lord_house": lord_house,
             "lord_sign": lord_sign,
-            "planets_in_house": [p for p in planets_in_house if p != "Asc"],
+            "planets_in_house": planets_in_house,
             "bhavadhipati_bala": round(adhipati, 2),
-            "bhava_digbala": round(digbala, 2),
+            "bhava_digbala": digbala,  # BHAVA_DIGBALA entries are whole numbers
             "bhava_drishti_bala": round(drishti, 2),
             "residential_strength": round(residential, 2),
             "planet_contribution": round(planet_contrib, 2),
@@ -957,759 +1150,679 @@ def calculate_bhava_bala(
     return bhava_bala
 
 
-def calculate_shad_bala(
-    planets_out: Dict,
-    lagna_sign: int,
-    lagna_longitude: float,
-    jd_ut: float,
-    birth_hour: float,
-    latitude: float,
-    longitude: float,
-) -> Dict:
-    """
-    Calculate Shad Bala (sixfold strength) for planets following AstroSage/B.V. Raman methodology.
-    
-    Traditional Shad Bala components:
-    1. Sthana Bala - Positional strength (5 sub-components)
-       - Uccha Bala (exaltation strength)
-       - Saptavargaja Bala (7 divisional chart strength)
-       - Ojayugma Bala (odd/even sign strength)
-       - Kendra Bala (angular house strength)
-       - Drekkana Bala (decanate strength)
-    2. Dig Bala - Directional strength
-    3. Kala Bala - Temporal strength (9 sub-components)
-       - Divaratri Bala (day/night strength)
-       - Paksha Bala (lunar phase strength)
-       - Tribhaga Bala (three-part day/night strength)
-       - Abda Bala (year lord strength)
-       - Masa Bala (month lord strength)
-       - Vara Bala (weekday lord strength)
-       - Hora Bala (hour lord strength)
-       - Ayana Bala (declination strength)
-       - Yuddha Bala (planetary war strength)
-    4. Chesta Bala - Motional strength (based on relative speed)
-    5. Naisargika Bala - Natural strength (fixed values)
-    6. Drik Bala - Aspectual strength (with partial aspects)
-    """
-    shad_bala: Dict[str, Dict] = {}
+# -----------------------------
+# Shad Bala reference tables
+# -----------------------------
 
-    # Deep debilitation points (Neecha) in degrees - classical Uccha Bala uses distance from Neecha
-    # Exaltation (Uccha) is exactly 180° opposite
-    DEBILITATION_DEG = {
-        "Sun": 190.0,      # 10° Libra (opposite of 10° Aries)
-        "Moon": 213.0,     # 3° Scorpio (opposite of 3° Taurus)
-        "Mars": 118.0,     # 28° Cancer (opposite of 28° Capricorn)
-        "Mercury": 345.0,  # 15° Pisces (opposite of 15° Virgo)
-        "Jupiter": 275.0,  # 5° Capricorn (opposite of 5° Cancer)
-        "Venus": 177.0,    # 27° Virgo (opposite of 27° Pisces)
-        "Saturn": 20.0,    # 20° Aries (opposite of 20° Libra)
-    }
+# Deep debilitation points (Neecha) in degrees - classical Uccha Bala uses distance from Neecha
+# Exaltation (Uccha) is exactly 180° opposite
+DEBILITATION_DEG = {
+    "Sun": 190.0,      # 10° Libra (opposite of 10° Aries)
+    "Moon": 213.0,     # 3° Scorpio (opposite of 3° Taurus)
+    "Mars": 118.0,     # 28° Cancer (opposite of 28° Capricorn)
+    "Mercury": 345.0,  # 15° Pisces (opposite of 15° Virgo)
+    "Jupiter": 275.0,  # 5° Capricorn (opposite of 5° Cancer)
+    "Venus": 177.0,    # 27° Virgo (opposite of 27° Pisces)
+    "Saturn": 20.0,    # 20° Aries (opposite of 20° Libra)
+}
 
-    # Dig Bala strongest houses (1=East/Asc, 4=North/IC, 7=West/Desc, 10=South/MC)
-    DIG_BALA_HOUSE = {
-        "Sun": 10,      # South (MC) - noon strength
-        "Mars": 10,     # South (MC) - noon strength
-        "Jupiter": 1,   # East (Asc) - morning strength
-        "Mercury": 1,   # East (Asc) - morning strength
-        "Saturn": 7,    # West (Desc) - evening strength
-        "Moon": 4,      # North (IC) - midnight strength
-        "Venus": 4,     # North (IC) - midnight strength
-    }
+# Dig Bala strongest houses (1=East/Asc, 4=North/IC, 7=West/Desc, 10=South/MC)
+DIG_BALA_HOUSE = {
+    "Sun": 10,      # South (MC) - noon strength
+    "Mars": 10,     # South (MC) - noon strength
+    "Jupiter": 1,   # East (Asc) - morning strength
+    "Mercury": 1,   # East (Asc) - morning strength
+    "Saturn": 7,    # West (Desc) - evening strength
+    "Moon": 4,      # North (IC) - midnight strength
+    "Venus": 4,     # North (IC) - midnight strength
+}
 
-    # Naisargika Bala (natural strength) - fixed values in Shashtiamsas
-    NAISARGIKA_BALA = {
-        "Sun": 60.0,
-        "Moon": 51.43,
-        "Venus": 42.85,
-        "Jupiter": 34.28,
-        "Mercury": 25.71,
-        "Mars": 17.14,
-        "Saturn": 8.57,
-        "Rahu": 8.57,
-        "Ketu": 8.57,
-    }
+# Naisargika Bala (natural strength) - fixed values in Shashtiamsas
+NAISARGIKA_BALA = {
+    "Sun": 60.0,
+    "Moon": 51.43,
+    "Venus": 42.85,
+    "Jupiter": 34.28,
+    "Mercury": 25.71,
+    "Mars": 17.14,
+    "Saturn": 8.57,
+    "Rahu": 8.57,
+    "Ketu": 8.57,
+}
 
-    # Required strength in Shashtiamsas (minimum for planet to be considered strong)
-    # These translate to Rupas: Sun=5, Moon=6, Mars=5, Mercury=7, Jupiter=6.5, Venus=5.5, Saturn=5
-    REQUIRED_STRENGTH = {
-        "Sun": 300,      # 5 Rupas
-        "Moon": 360,     # 6 Rupas
-        "Mars": 300,     # 5 Rupas
-        "Mercury": 420,  # 7 Rupas
-        "Jupiter": 390,  # 6.5 Rupas
-        "Venus": 330,    # 5.5 Rupas
-        "Saturn": 300,   # 5 Rupas
-        "Rahu": 300,
-        "Ketu": 300,
-    }
+# Required strength in Shashtiamsas (minimum for planet to be considered strong)
+# These translate to Rupas: Sun=5, Moon=6, Mars=5, Mercury=7, Jupiter=6.5, Venus=5.5, Saturn=5
+REQUIRED_STRENGTH = {
+    "Sun": 300,      # 5 Rupas
+    "Moon": 360,     # 6 Rupas
+    "Mars": 300,     # 5 Rupas
+    "Mercury": 420,  # 7 Rupas
+    "Jupiter": 390,  # 6.5 Rupas
+    "Venus": 330,    # 5.5 Rupas
+    "Saturn": 300,   # 5 Rupas
+    "Rahu": 300,
+    "Ketu": 300,
+}
 
-    # Moolatrikona signs (0-indexed)
-    MOOLATRIKONA = {
-        "Sun": 4,       # Leo (0-20°)
-        "Moon": 1,      # Taurus (4-30°)
-        "Mars": 0,      # Aries (0-12°)
-        "Mercury": 5,   # Virgo (16-20°)
-        "Jupiter": 8,   # Sagittarius (0-10°)
-        "Venus": 6,     # Libra (0-15°)
-        "Saturn": 10,   # Aquarius (0-20°)
-    }
+# The same thresholds in Rupas (60 Shashtiamsas each); unlisted planets need 5
+REQUIRED_RUPAS = {planet: required / 60.0 for planet, required in REQUIRED_STRENGTH.items()}
+
+# Moolatrikona signs (0-indexed)
+MOOLATRIKONA = {
+    "Sun": 4,       # Leo (0-20°)
+    "Moon": 1,      # Taurus (4-30°)
+    "Mars": 0,      # Aries (0-12°)
+    "Mercury": 5,   # Virgo (16-20°)
+    "Jupiter": 8,   # Sagittarius (0-10°)
+    "Venus": 6,     # Libra (0-15°)
+    "Saturn": 10,   # Aquarius (0-20°)
+}
 
-    # Own signs for each planet
-    OWN_SIGNS = {
-        "Sun": [4],           # Leo
-        "Moon": [3],          # Cancer
-        "Mars": [0, 7],       # Aries, Scorpio
-        "Mercury": [2, 5],    # Gemini, Virgo
-        "Jupiter": [8, 11],   # Sagittarius, Pisces
-        "Venus": [1, 6],      # Taurus, Libra
-        "Saturn": [9, 10],    # Capricorn, Aquarius
-        "Rahu": [10],         # Aquarius (some traditions)
-        "Ketu": [7],          # Scorpio (some traditions)
-    }
+# Moolatrikona degree range within that sign (inclusive)
+MOOLATRIKONA_RANGE = {
+    "Sun": (0, 20),
+    "Moon": (4, 30),
+    "Mars": (0, 12),
+    "Mercury": (16, 20),
+    "Jupiter": (0, 10),
+    "Venus": (0, 15),
+    "Saturn": (0, 20),
+}
 
-    # Natural friendships
-    NATURAL_FRIENDS = {
-        "Sun": ["Moon", "Mars", "Jupiter"],
-        "Moon": ["Sun", "Mercury"],
-        "Mars": ["Sun", "Moon", "Jupiter"],
-        "Mercury": ["Sun", "Venus"],
-        "Jupiter": ["Sun", "Moon", "Mars"],
-        "Venus": ["Mercury", "Saturn"],
-        "Saturn": ["Mercury", "Venus"],
-        "Rahu": ["Mercury", "Venus", "Saturn"],
-    }
+# Own signs for each planet
+OWN_SIGNS = {
+    "Sun": (4,),          # Leo
+    "Moon": (3,),         # Cancer
+    "Mars": (0, 7),       # Aries, Scorpio
+    "Mercury": (2, 5),    # Gemini, Virgo
+    "Jupiter": (8, 11),   # Sagittarius, Pisces
+    "Venus": (1, 6),      # Taurus, Libra
+    "Saturn": (9, 10),    # Capricorn, Aquarius
+    "Rahu": (10,),        # Aquarius (some traditions)
+    "Ketu": (7,),         # Scorpio (some traditions)
+}
 
-    NATURAL_ENEMIES = {
-        "Sun": ["Venus", "Saturn"],
-        "Moon": [],
-        "Mars": ["Mercury"],
-        "Mercury": ["Moon"],
-        "Jupiter": ["Mercury", "Venus"],
-        "Venus": ["Sun", "Moon"],
-        "Saturn": ["Sun", "Moon", "Mars"],
-        "Rahu": ["Sun", "Moon", "Mars"],
-    }
+# Natural friendships
+NATURAL_FRIENDS = {
+    "Sun": ("Moon", "Mars", "Jupiter"),
+    "Moon": ("Sun", "Mercury"),
+    "Mars": ("Sun", "Moon", "Jupiter"),
+    "Mercury": ("Sun", "Venus"),
+    "Jupiter": ("Sun", "Moon", "Mars"),
+    "Venus": ("Mercury", "Saturn"),
+    "Saturn": ("Mercury", "Venus"),
+    "Rahu": ("Mercury", "Venus", "Saturn"),
+}
 
-    # Average daily motion in degrees
-    AVERAGE_SPEED = {
-        "Sun": 0.9856,
-        "Moon": 13.1764,
-        "Mars": 0.5240,
-        "Mercury": 1.3833,
-        "Jupiter": 0.0831,
-        "Venus": 1.2000,
-        "Saturn": 0.0335,
-    }
+NATURAL_ENEMIES = {
+    "Sun": ("Venus", "Saturn"),
+    "Moon": (),
+    "Mars": ("Mercury",),
+    "Mercury": ("Moon",),
+    "Jupiter": ("Mercury", "Venus"),
+    "Venus": ("Sun", "Moon"),
+    "Saturn": ("Sun", "Moon", "Mars"),
+    "Rahu": ("Sun", "Moon", "Mars"),
+}
 
-    # Weekday lords (0=Sunday)
-    WEEKDAY_LORDS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+# Average daily motion in degrees
+AVERAGE_SPEED = {
+    "Sun": 0.9856,
+    "Moon": 13.1764,
+    "Mars": 0.5240,
+    "Mercury": 1.3833,
+    "Jupiter": 0.0831,
+    "Venus": 1.2000,
+    "Saturn": 0.0335,
+}
 
-    # Classical Shadbala does not cap component values - they sum naturally
-    # Typical ranges (for reference only, not used for capping):
-    # - Sthana Bala: 100-250+ virupa
-    # - Dig Bala: 0-60 virupa
-    # - Kala Bala: 50-200+ virupa
-    # - Chesta Bala: 0-60 virupa
-    # - Naisargika Bala: 8.57-60 virupa (fixed)
-    # - Drik Bala: can be positive or negative
+# Kendra Bala by house: Kendra=60, Panapara=30, anything else (Apoklima)=15
+KENDRA_BALA = {
+    1: 60.0, 4: 60.0, 7: 60.0, 10: 60.0,
+    2: 30.0, 5: 30.0, 8: 30.0, 11: 30.0,
+}
 
-    def normalize(deg: float) -> float:
-        d = deg % 360.0
-        return d if d >= 0 else d + 360.0
+# Drekkana (0-2) in which each planet gets Drekkana Bala:
+# male 1st, neutral 2nd, female 3rd
+DREKKANA_STRONG_PART = {
+    "Sun": 0, "Jupiter": 0, "Mars": 0,
+    "Saturn": 1, "Mercury": 1,
+    "Moon": 2, "Venus": 2,
+}
 
-    def angular_distance(a: float, b: float) -> float:
-        d = abs(normalize(a) - normalize(b))
-        return min(d, 360.0 - d)
+# Planets that gain Ojayugma Bala in even signs (the rest gain in odd signs)
+EVEN_SIGN_PLANETS = frozenset(("Moon", "Venus"))
 
-    def get_sign(lon: float) -> int:
-        return int(normalize(lon) // 30)
+# Divaratri Bala: strong at midnight / strong at noon (Mercury is always strong)
+NIGHT_STRONG_PLANETS = frozenset(("Moon", "Saturn", "Mars"))
+DAY_STRONG_PLANETS = frozenset(("Sun", "Jupiter", "Venus"))
 
-    def get_navamsa_sign_local(lon: float) -> int:
-        """
-        Get Navamsa (D9) sign index from longitude.
-        Uses correct element-based starting signs.
-        """
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        degree_in_sign = lon % 30
-        navamsa_pada = int(degree_in_sign / (30.0 / 9.0))  # 0-8
-        
-        # Determine starting sign based on element
-        element = sign_index % 4  # 0=Fire, 1=Earth, 2=Air, 3=Water
-        if element == 0:  # Fire (Aries, Leo, Sag)
-            start_sign = 0  # Aries
-        elif element == 1:  # Earth (Taurus, Virgo, Cap)
-            start_sign = 9  # Capricorn
-        elif element == 2:  # Air (Gemini, Libra, Aqu)
-            start_sign = 6  # Libra
-        else:  # Water (Cancer, Scorpio, Pisces)
-            start_sign = 3  # Cancer
-        
-        return (start_sign + navamsa_pada) % 12
-
-    def get_drekkana_sign(lon: float) -> int:
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        deg_in_sign = lon % 30
-        if deg_in_sign < 10:
-            return sign_index
-        elif deg_in_sign < 20:
-            return (sign_index + 4) % 12
-        else:
-            return (sign_index + 8) % 12
-
-    def get_saptamsa_sign(lon: float) -> int:
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        deg_in_sign = lon % 30
-        saptamsa_num = int(deg_in_sign / (30 / 7))
-        if sign_index % 2 == 0:  # Odd sign
-            return (sign_index + saptamsa_num) % 12
-        else:  # Even sign
-            return (sign_index + 6 + saptamsa_num) % 12
-
-    def get_dwadasamsa_sign(lon: float) -> int:
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        deg_in_sign = lon % 30
-        dwadasamsa_num = int(deg_in_sign / 2.5)
-        return (sign_index + dwadasamsa_num) % 12
-
-    def get_trimsamsa_sign(lon: float) -> int:
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        deg_in_sign = lon % 30
-        # Trimsamsa division varies by odd/even sign
-        if sign_index % 2 == 0:  # Odd sign
-            if deg_in_sign < 5:
-                return 0  # Aries (Mars)
-            elif deg_in_sign < 10:
-                return 10  # Aquarius (Saturn)
-            elif deg_in_sign < 18:
-                return 8  # Sagittarius (Jupiter)
-            elif deg_in_sign < 25:
-                return 2  # Gemini (Mercury)
-            else:
-                return 6  # Libra (Venus)
-        else:  # Even sign
-            if deg_in_sign < 5:
-                return 1  # Taurus (Venus)
-            elif deg_in_sign < 12:
-                return 5  # Virgo (Mercury)
-            elif deg_in_sign < 20:
-                return 11  # Pisces (Jupiter)
-            elif deg_in_sign < 25:
-                return 9  # Capricorn (Saturn)
-            else:
-                return 7  # Scorpio (Mars)
-
-    def get_hora_sign(lon: float) -> int:
-        lon = normalize(lon)
-        sign_index = int(lon // 30)
-        deg_in_sign = lon % 30
-        if sign_index % 2 == 0:  # Odd sign
-            return 4 if deg_in_sign < 15 else 3  # Leo or Cancer
-        else:  # Even sign
-            return 3 if deg_in_sign < 15 else 4  # Cancer or Leo
-
-    def is_own_sign(planet: str, sign: int) -> bool:
-        return sign in OWN_SIGNS.get(planet, [])
-
-    def is_moolatrikona(planet: str, lon: float) -> bool:
-        sign = get_sign(lon)
-        deg_in_sign = lon % 30
-        mt_sign = MOOLATRIKONA.get(planet)
-        if mt_sign is None or sign != mt_sign:
-            return False
-        # Check degree ranges for moolatrikona
-        if planet == "Sun" and 0 <= deg_in_sign <= 20:
-            return True
-        if planet == "Moon" and 4 <= deg_in_sign <= 30:
-            return True
-        if planet == "Mars" and 0 <= deg_in_sign <= 12:
-            return True
-        if planet == "Mercury" and 16 <= deg_in_sign <= 20:
-            return True
-        if planet == "Jupiter" and 0 <= deg_in_sign <= 10:
-            return True
-        if planet == "Venus" and 0 <= deg_in_sign <= 15:
-            return True
-        if planet == "Saturn" and 0 <= deg_in_sign <= 20:
-            return True
-        return False
+# Ayana Bala: planets favoured by northern declination (the rest by southern)
+NORTH_AYANA_PLANETS = frozenset(("Sun", "Mars", "Jupiter", "Venus", "Mercury"))
 
-    def get_relationship(planet: str, sign: int) -> str:
-        """Get relationship of planet with sign lord."""
-        sign_lords = {
-            0: "Mars", 1: "Venus", 2: "Mercury", 3: "Moon",
-            4: "Sun", 5: "Mercury", 6: "Venus", 7: "Mars",
-            8: "Jupiter", 9: "Saturn", 10: "Saturn", 11: "Jupiter"
-        }
-        lord = sign_lords.get(sign)
-        if lord == planet:
-            return "own"
-        if lord in NATURAL_FRIENDS.get(planet, []):
-            return "friend"
-        if lord in NATURAL_ENEMIES.get(planet, []):
-            return "enemy"
-        return "neutral"
-
-    # ==================== STHANA BALA ====================
-
-    def uccha_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Classical Uccha Bala: max 60 Virupa at exaltation, 0 at debilitation.
-        Formula: distance_from_neecha / 3 (since 180/3 = 60 max).
-        """
-        neecha = DEBILITATION_DEG.get(planet_name)
-        if neecha is None:
-            return 30.0  # Neutral for nodes (Rahu/Ketu)
-        d = angular_distance(planet_lon, neecha)  # 0..180
-        return d / 3.0  # Max 60 at exaltation (180° from neecha)
+# Planets without Chesta Bala in this model (luminaries and nodes)
+NO_CHESTA_PLANETS = frozenset(("Sun", "Moon", "Rahu", "Ketu"))
 
-    def saptavargaja_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Strength from 7 divisional charts: Rasi, Hora, Drekkana, Saptamsa, Navamsa, Dwadasamsa, Trimsamsa.
-        Moolatrikona=45, Own=30, Great Friend=22.5, Friend=15, Neutral=7.5, Enemy=3.75, Great Enemy=1.875
-        """
-        total = 0.0
-        rasi_sign = get_sign(planet_lon)
-        
-        # Rasi chart (special: moolatrikona gives 45)
-        if is_moolatrikona(planet_name, planet_lon):
-            total += 45.0
-        elif is_own_sign(planet_name, rasi_sign):
-            total += 30.0
-        else:
-            rel = get_relationship(planet_name, rasi_sign)
-            if rel == "friend":
-                total += 15.0
-            elif rel == "enemy":
-                total += 3.75
-            else:
-                total += 7.5
-
-        # Other 6 vargas
-        varga_signs = [
-            get_hora_sign(planet_lon),
-            get_drekkana_sign(planet_lon),
-            get_saptamsa_sign(planet_lon),
-            get_navamsa_sign_local(planet_lon),
-            get_dwadasamsa_sign(planet_lon),
-            get_trimsamsa_sign(planet_lon),
-        ]
-
-        for varga_sign in varga_signs:
-            if is_own_sign(planet_name, varga_sign):
-                total += 30.0
-            else:
-                rel = get_relationship(planet_name, varga_sign)
-                if rel == "friend":
-                    total += 15.0
-                elif rel == "enemy":
-                    total += 3.75
-                else:
-                    total += 7.5
+# Weekday lords (0=Sunday)
+WEEKDAY_LORDS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn")
 
-        return total
+# Drik Bala sign of each aspecting planet: +1 benefic, -1 malefic.
+# Ketu (and anything unlisted) casts no counted aspect.
+DRIK_NATURE = {
+    planet: 1 if planet in BENEFICS else -1
+    for planet in BENEFICS | MALEFICS
+    if planet != "Ketu"
+}
 
-    def ojayugma_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Odd/Even sign strength.
-        Moon/Venus get 15 in even signs, others get 15 in odd signs.
-        Same applies to navamsa. Max 30.
-        """
-        rasi_sign = get_sign(planet_lon)
-        navamsa_sign = get_navamsa_sign_local(planet_lon)
-        total = 0.0
+# Aspect strength curve (see _get_aspect_strength): segment boundaries in
+# degrees, and for each segment (base strength, start angle, rise, run).
+# Full aspects at 175-180 (60), squares at 85-95 (45), trines at 115-125 (30)
+# and sextiles at 55-65 (15), interpolated linearly in between.
+ASPECT_BREAKS = (55, 65, 85, 95, 115, 125, 175)
+ASPECT_SEGMENTS = (
+    (0.0, 0, 0.0, 1),          # < 55: no aspect
+    (15.0, 55, 0.0, 1),        # sextile
+    (15.0, 65, 45.0 - 15.0, 20),
+    (45.0, 85, 0.0, 1),        # square
+    (45.0, 95, 30.0 - 45.0, 20),
+    (30.0, 115, 0.0, 1),       # trine
+    (30.0, 125, 60.0 - 30.0, 50),
+    (60.0, 175, 0.0, 1),       # opposition
+)
+
+# Hora (planetary hour) cycle as weekday-lord indices: Sun, Mercury, Saturn,
+# Mars, Venus, Moon, Jupiter; HORA_START is each weekday's position in it
+HORA_SEQUENCE = (0, 3, 6, 2, 5, 1, 4)
+HORA_START = tuple(HORA_SEQUENCE.index(weekday) for weekday in range(7))
+
+# Tribhaga lords for the three parts of the day and of the night
+TRIBHAGA_DAY_LORDS = ("Mercury", "Sun", "Saturn")
+TRIBHAGA_NIGHT_LORDS = ("Moon", "Venus", "Mars")
+
+# Trimsamsa (D30) degree boundaries and the sign each portion maps to
+# Odd signs: Mars, Saturn, Jupiter, Mercury, Venus
+# Even signs: Venus, Mercury, Jupiter, Saturn, Mars
+_TRIMSAMSA_BOUNDS_ODD = (5, 10, 18, 25)
+_TRIMSAMSA_SIGNS_ODD = (0, 10, 8, 2, 6)
+_TRIMSAMSA_BOUNDS_EVEN = (5, 12, 20, 25)
+_TRIMSAMSA_SIGNS_EVEN = (1, 5, 11, 9, 7)
+
+
+def saptavarga_signs(lon: float) -> Tuple[int, int, int, int, int, int, int]:
+    """
+    Sign indices of `lon` in the seven vargas used by Saptavargaja Bala:
+    (Rasi, Hora, Drekkana, Saptamsa, Navamsa, Dwadasamsa, Trimsamsa).
+    The longitude is normalized and split into sign/degree only once.
+    """
+    lon = norm_deg(lon)
+    sign_index = int(lon // 30)
+    deg_in_sign = lon % 30
+    odd_sign = sign_index % 2 == 0  # 0-indexed, so even index = odd sign
 
-        is_female = planet_name in ("Moon", "Venus")
-        rasi_even = (rasi_sign % 2 == 1)  # 0-indexed, so odd index = even sign
-        navamsa_even = (navamsa_sign % 2 == 1)
+    if odd_sign:
+        hora = 4 if deg_in_sign < 15 else 3  # Leo or Cancer
+        saptamsa = (sign_index + int(deg_in_sign / (30 / 7))) % 12
+        trimsamsa = _TRIMSAMSA_SIGNS_ODD[bisect_right(_TRIMSAMSA_BOUNDS_ODD, deg_in_sign)]
+    else:
+        hora = 3 if deg_in_sign < 15 else 4  # Cancer or Leo
+        saptamsa = (sign_index + 6 + int(deg_in_sign / (30 / 7))) % 12
+        trimsamsa = _TRIMSAMSA_SIGNS_EVEN[bisect_right(_TRIMSAMSA_BOUNDS_EVEN, deg_in_sign)]
+
+    if deg_in_sign < 10:
+        drekkana = sign_index
+    elif deg_in_sign < 20:
+        drekkana = (sign_index + 4) % 12
+    else:
+        drekkana = (sign_index + 8) % 12
+
+    return (
+        sign_index,
+        hora,
+        drekkana,
+        saptamsa,
+        _navamsa_index(sign_index, deg_in_sign),
+        (sign_index + int(deg_in_sign / 2.5)) % 12,
+        trimsamsa,
+    )
 
-        if is_female:
-            if rasi_even:
-                total += 15.0
-            if navamsa_even:
-                total += 15.0
-        else:
-            if not rasi_even:
-                total += 15.0
-            if not navamsa_even:
-                total += 15.0
 
-        return total
+# -----------------------------
+# Shad Bala components
+# -----------------------------
 
-    def kendra_bala(planet_name: str, house: int) -> float:
-        """Angular house strength: Kendra=60, Panapara=30, Apoklima=15."""
-        if house in (1, 4, 7, 10):
-            return 60.0
-        elif house in (2, 5, 8, 11):
-            return 30.0
-        else:
-            return 15.0
+def _varga_sign_points(planet: str, sign: int) -> float:
+    """Saptavargaja points for `planet` placed in `sign` (outside moolatrikona)."""
+    if sign in OWN_SIGNS.get(planet, ()):
+        return 30.0
+    lord = SIGN_RULERS[sign]
+    if lord == planet:
+        return 7.5  # Lord but not listed as own sign: scored as neutral
+    if lord in NATURAL_FRIENDS.get(planet, ()):
+        return 15.0
+    if lord in NATURAL_ENEMIES.get(planet, ()):
+        return 3.75
+    return 7.5
+
+
+# Saptavargaja points per planet, indexed by sign (0=Aries .. 11=Pisces)
+VARGA_SIGN_POINTS = {
+    planet: tuple(_varga_sign_points(planet, sign) for sign in range(12))
+    for planet in NAISARGIKA_BALA
+}
+_NEUTRAL_VARGA_POINTS = (7.5,) * 12
 
-    def drekkana_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Decanate strength based on planet gender.
-        Male (Sun, Jupiter, Mars): strong in 1st drekkana (0-10°)
-        Neutral (Saturn, Mercury): strong in 2nd drekkana (10-20°)
-        Female (Moon, Venus): strong in 3rd drekkana (20-30°)
-        """
-        deg_in_sign = normalize(planet_lon) % 30
-        drekkana = 1 if deg_in_sign < 10 else (2 if deg_in_sign < 20 else 3)
-
-        male_planets = ("Sun", "Jupiter", "Mars")
-        neutral_planets = ("Saturn", "Mercury")
-        female_planets = ("Moon", "Venus")
-
-        if planet_name in male_planets and drekkana == 1:
-            return 15.0
-        elif planet_name in neutral_planets and drekkana == 2:
-            return 15.0
-        elif planet_name in female_planets and drekkana == 3:
-            return 15.0
-        return 0.0
 
-    def calc_sthana_bala(planet_name: str, planet_lon: float, house: int) -> Dict:
-        """Calculate total Sthana Bala with all 5 components (classical, no capping)."""
-        uccha = uccha_bala(planet_name, planet_lon)
-        saptavargaja = saptavargaja_bala(planet_name, planet_lon)
-        ojayugma = ojayugma_bala(planet_name, planet_lon)
-        kendra = kendra_bala(planet_name, house)
-        drekkana = drekkana_bala(planet_name, planet_lon)
-
-        total = uccha + saptavargaja + ojayugma + kendra + drekkana
-
-        return {
-            "uccha": round(uccha, 2),
-            "saptavargaja": round(saptavargaja, 2),
-            "ojayugma": round(ojayugma, 2),
-            "kendra": round(kendra, 2),
-            "drekkana": round(drekkana, 2),
-            "total": round(total, 2),
-        }
+# ==================== STHANA BALA ====================
 
-    # ==================== DIG BALA ====================
 
-    def dig_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Directional strength based on house position.
-        Max 60 at strongest house midpoint, 0 at opposite.
-        """
-        strongest_house = DIG_BALA_HOUSE.get(planet_name)
-        if strongest_house is None:
-            return 30.0  # Neutral for Rahu/Ketu
-        
-        # Calculate midpoint of strongest house
-        strongest_long = normalize(lagna_longitude + (strongest_house - 1) * 30)
-        d = angular_distance(planet_lon, strongest_long)
-        return max(0.0, (180.0 - d) / 3.0)
-
-    # ==================== KALA BALA ====================
-
-    def get_weekday(jd: float) -> int:
-        """Get weekday from Julian day (0=Sunday, 1=Monday, etc.)."""
-        return int(jd + 1.5) % 7
-
-    def get_year_lord(jd: float) -> str:
-        """Get lord of the year (Abda lord)."""
-        # Using 360-day year calculation
-        year_num = int((jd - 588465.5) / 360) % 7
-        return WEEKDAY_LORDS[year_num]
-
-    def get_month_lord(jd: float) -> str:
-        """Get lord of the month (Masa lord)."""
-        # Using 30-day month calculation
-        month_num = int((jd - 588465.5) / 30) % 7
-        return WEEKDAY_LORDS[month_num]
-
-    def get_hora_lord(jd: float, birth_hour: float, lat: float, lon: float) -> str:
-        """Get lord of the hora (planetary hour)."""
-        weekday = get_weekday(jd)
-        # Simplified hora calculation
-        hora_num = int(birth_hour) % 24
-        # Hora sequence starts from weekday lord
-        hora_sequence = [0, 3, 6, 2, 5, 1, 4]  # Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn order
-        start_idx = hora_sequence.index(weekday)
-        current_idx = (start_idx + hora_num) % 7
-        return WEEKDAY_LORDS[hora_sequence[current_idx]]
-
-    def divaratri_bala(planet_name: str, birth_hour: float, is_day: bool) -> float:
-        """
-        Day/Night strength.
-        Moon, Saturn, Mars: strong at midnight (60), weak at noon (0)
-        Sun, Jupiter, Venus: strong at noon (60), weak at midnight (0)
-        Mercury: always 60
-        """
-        if planet_name == "Mercury":
-            return 60.0
-        
-        night_planets = ("Moon", "Saturn", "Mars")
-        day_planets = ("Sun", "Jupiter", "Venus")
-        
-        # Calculate strength based on time of day
-        # 0 = midnight, 12 = noon
-        hour_from_midnight = birth_hour if birth_hour < 12 else 24 - birth_hour
-        
-        if planet_name in night_planets:
-            # Strong at midnight, weak at noon
-            return (12 - abs(hour_from_midnight)) * 5
-        elif planet_name in day_planets:
-            # Strong at noon, weak at midnight
-            return abs(hour_from_midnight) * 5
-        return 30.0
+def _calc_sthana_bala(planet_name: str, planet_lon: float, house: int) -> Dict:
+    """
+    Calculate total Sthana Bala with all 5 components (classical, no capping).
+
+    - Uccha: max 60 Virupa at exaltation, 0 at debilitation
+      (distance_from_neecha / 3, since 180/3 = 60 max)
+    - Saptavargaja: strength from the 7 divisional charts (Rasi, Hora, Drekkana,
+      Saptamsa, Navamsa, Dwadasamsa, Trimsamsa). Moolatrikona=45, Own=30,
+      Friend=15, Neutral=7.5, Enemy=3.75
+    - Ojayugma: Moon/Venus get 15 in even signs, others in odd signs;
+      same again for navamsa. Max 30
+    - Kendra: Kendra=60, Panapara=30, Apoklima=15
+    - Drekkana: 15 when the planet is in its gender's decanate
+      (male 1st, neutral 2nd, female 3rd)
+
+    The longitude is split into sign, degree and varga signs once and every
+    component is derived from that.
+    """
+    lon = norm_deg(planet_lon)
+    deg_in_sign = lon % 30
+    signs = saptavarga_signs(lon)
+    rasi_sign = signs[0]
+
+    # Uccha
+    neecha = DEBILITATION_DEG.get(planet_name)
+    if neecha is None:
+        uccha = 30.0  # Neutral for nodes (Rahu/Ketu)
+    else:
+        uccha = angular_distance(lon, neecha) / 3.0
+
+    # Saptavargaja (Rasi chart is special: moolatrikona gives 45)
+    points = VARGA_SIGN_POINTS.get(planet_name, _NEUTRAL_VARGA_POINTS)
+    mt_range = MOOLATRIKONA_RANGE.get(planet_name)
+    in_moolatrikona = (
+        mt_range is not None
+        and rasi_sign == MOOLATRIKONA[planet_name]
+        and mt_range[0] <= deg_in_sign <= mt_range[1]
+    )
+    saptavargaja = 0.0
+    if in_moolatrikona:
+        saptavargaja += 45.0
+    else:
+        saptavargaja += points[rasi_sign]
+    for varga_sign in signs[1:]:
+        saptavargaja += points[varga_sign]
 
-    def paksha_bala(sun_lon: float, moon_lon: float, planet_name: str) -> float:
-        """
-        Lunar phase strength.
-        Benefics (Jupiter, Venus, Moon, Mercury): strong in Shukla Paksha (waxing)
-        Malefics (Sun, Mars, Saturn): strong in Krishna Paksha (waning)
-        Moon's paksha bala is doubled.
-        """
-        # Calculate tithi (lunar day)
-        diff = normalize(moon_lon - sun_lon)
-        
-        benefics = ("Jupiter", "Venus", "Moon", "Mercury")
-        
-        if planet_name in benefics:
-            bala = diff / 3.0  # Max 60 at full moon
-        else:
-            bala = (180.0 - min(diff, 360 - diff)) / 3.0
-        
-        # Double Moon's paksha bala
-        if planet_name == "Moon":
-            bala *= 2.0
-        
-        return min(60.0, bala)
+    # Ojayugma (0-indexed signs, so odd index = even sign)
+    parity = 1 if planet_name in EVEN_SIGN_PLANETS else 0
+    ojayugma = (15.0 if rasi_sign % 2 == parity else 0.0) + (15.0 if signs[4] % 2 == parity else 0.0)
 
-    def tribhaga_bala(planet_name: str, birth_hour: float, sunrise: float = 6.0, sunset: float = 18.0) -> float:
-        """
-        Three-part day/night strength.
-        Jupiter always gets 60.
-        Day: 1st part=Mercury, 2nd part=Sun, 3rd part=Saturn
-        Night: 1st part=Moon, 2nd part=Venus, 3rd part=Mars
-        """
-        if planet_name == "Jupiter":
-            return 60.0
-        
-        day_length = sunset - sunrise
-        night_length = 24 - day_length
-        
-        if sunrise <= birth_hour < sunset:  # Daytime
-            time_in_day = birth_hour - sunrise
-            part = int(time_in_day / (day_length / 3))
-            if part == 0 and planet_name == "Mercury":
-                return 60.0
-            elif part == 1 and planet_name == "Sun":
-                return 60.0
-            elif part == 2 and planet_name == "Saturn":
-                return 60.0
-        else:  # Nighttime
-            if birth_hour >= sunset:
-                time_in_night = birth_hour - sunset
-            else:
-                time_in_night = birth_hour + (24 - sunset)
-            part = int(time_in_night / (night_length / 3))
-            if part == 0 and planet_name == "Moon":
-                return 60.0
-            elif part == 1 and planet_name == "Venus":
-                return 60.0
-            elif part == 2 and planet_name == "Mars":
-                return 60.0
-        
-        return 0.0
+    kendra = KENDRA_BALA.get(house, 15.0)
+
+    # Drekkana (0 = 0-10°, 1 = 10-20°, 2 = 20-30°)
+    drekkana_part = 0 if deg_in_sign < 10 else (1 if deg_in_sign < 20 else 2)
+    drekkana = 15.0 if DREKKANA_STRONG_PART.get(planet_name) == drekkana_part else 0.0
+
+    total = uccha + saptavargaja + ojayugma + kendra + drekkana
 
-    def abda_bala(planet_name: str, jd: float) -> float:
-        """Year lord gets 15 Shashtiamsas."""
-        return 15.0 if planet_name == get_year_lord(jd) else 0.0
+    # Saptavargaja, ojayugma, kendra and drekkana are sums of table values
+    # with at most two decimals, so only the computed parts need rounding
+    return {
+        "uccha": round(uccha, 2),
+        "saptavargaja": saptavargaja,
+        "ojayugma": ojayugma,
+        "kendra": kendra,
+        "drekkana": drekkana,
+        "total": round(total, 2),
+    }
 
-    def masa_bala(planet_name: str, jd: float) -> float:
-        """Month lord gets 30 Shashtiamsas."""
-        return 30.0 if planet_name == get_month_lord(jd) else 0.0
 
-    def vara_bala(planet_name: str, jd: float) -> float:
-        """Weekday lord gets 45 Shashtiamsas."""
-        weekday = get_weekday(jd)
-        return 45.0 if planet_name == WEEKDAY_LORDS[weekday] else 0.0
+# ==================== DIG BALA ====================
 
-    def hora_bala(planet_name: str, jd: float, birth_hour: float, lat: float, lon: float) -> float:
-        """Hora lord gets 60 Shashtiamsas."""
-        return 60.0 if planet_name == get_hora_lord(jd, birth_hour, lat, lon) else 0.0
 
-    def ayana_bala(planet_name: str, planet_lon: float) -> float:
-        """
-        Declination-based strength.
-        Northern declination favors Sun, Mars, Jupiter, Venus, Mercury.
-        Southern declination favors Moon, Saturn.
-        Sun's ayana bala is doubled.
-        """
-        # Calculate approximate declination from longitude
-        # Using simplified formula: decl = 23.45 * sin(longitude)
-        decl = 23.45 * math.sin(math.radians(planet_lon))
-        
-        north_planets = ("Sun", "Mars", "Jupiter", "Venus", "Mercury")
-        
-        if planet_name in north_planets:
-            bala = 30.0 + (decl * 30.0 / 23.45)
+def _dig_bala_all(names: Sequence[str], lons: Sequence[float], lagna_longitude: float) -> List[float]:
+    """
+    Directional strength of every planet, aligned with `names`.
+    Max 60 at strongest house midpoint, 0 at opposite; Rahu/Ketu are neutral (30).
+    The strongest-house longitudes only depend on the lagna, so they are
+    resolved once for the whole chart.
+    """
+    strongest_longs = {
+        planet: norm_deg(lagna_longitude + (strongest_house - 1) * 30)
+        for planet, strongest_house in DIG_BALA_HOUSE.items()
+    }
+    digs = []
+    for planet_name, planet_lon in zip(names, lons):
+        strongest_long = strongest_longs.get(planet_name)
+        if strongest_long is None:
+            digs.append(30.0)
         else:
-            bala = 30.0 - (decl * 30.0 / 23.45)
-        
-        # Double Sun's ayana bala
-        if planet_name == "Sun":
-            bala *= 2.0
-        
-        return max(0.0, min(60.0, bala))
-
-    def calc_kala_bala(
-        planet_name: str,
-        planet_lon: float,
-        sun_lon: float,
-        moon_lon: float,
-        jd: float,
-        birth_hour: float,
-        lat: float,
-        lon: float,
-    ) -> Dict:
-        """Calculate total Kala Bala with all components (classical, no capping)."""
-        divaratri = divaratri_bala(planet_name, birth_hour, True)
-        paksha = paksha_bala(sun_lon, moon_lon, planet_name)
-        tribhaga = tribhaga_bala(planet_name, birth_hour)
-        abda = abda_bala(planet_name, jd)
-        masa = masa_bala(planet_name, jd)
-        vara = vara_bala(planet_name, jd)
-        hora = hora_bala(planet_name, jd, birth_hour, lat, lon)
-        ayana = ayana_bala(planet_name, planet_lon)
-
-        total = divaratri + paksha + tribhaga + abda + masa + vara + hora + ayana
-
-        return {
-            "divaratri": round(divaratri, 2),
-            "paksha": round(paksha, 2),
-            "tribhaga": round(tribhaga, 2),
-            "abda": round(abda, 2),
-            "masa": round(masa, 2),
-            "vara": round(vara, 2),
-            "hora": round(hora, 2),
-            "ayana": round(ayana, 2),
-            "total": round(total, 2),
-        }
+            digs.append(max(0.0, (180.0 - angular_distance(planet_lon, strongest_long)) / 3.0))
+    return digs
 
-    # ==================== CHESTA BALA ====================
 
-    def chesta_bala(planet_name: str, speed: float, is_retrograde: bool) -> float:
-        """
-        Motional strength based on relative speed.
-        Retrograde planets get high chesta bala (up to 60).
-        Sun and Moon don't get chesta bala.
-        """
-        # Nodes (Rahu/Ketu) don't use classical Chesta Bala in this simplified model
-        if planet_name in ("Sun", "Moon", "Rahu", "Ketu"):
-            return 0.0
-        
-        avg_speed = AVERAGE_SPEED.get(planet_name, 1.0)
-        if avg_speed == 0:
-            return 30.0
-        
-        # Relative speed ratio
-        speed_ratio = abs(speed) / avg_speed
-        
-        if is_retrograde:
-            # Retrograde planets are considered strong
-            return 60.0
-        elif speed_ratio < 0.5:
-            # Very slow (almost stationary) - strong
-            return 45.0 + (0.5 - speed_ratio) * 30
-        elif speed_ratio < 1.0:
-            # Slower than average
-            return 30.0 + (1.0 - speed_ratio) * 30
+# ==================== KALA BALA ====================
+
+
+def _time_lords(jd: float, birth_hour: float) -> Tuple[str, str, str, str]:
+    """
+    Lords of the (year, month, weekday, hora) at `jd`, computed once per chart
+    for Abda, Masa, Vara and Hora Bala.
+    """
+    weekday = int(jd + 1.5) % 7  # 0=Sunday, 1=Monday, etc.
+    # Using 360-day year and 30-day month calculation
+    year_num = int((jd - 588465.5) / 360) % 7
+    month_num = int((jd - 588465.5) / 30) % 7
+    # Simplified hora calculation: hora sequence starts from weekday lord
+    hora_num = int(birth_hour) % 24
+    current_idx = (HORA_START[weekday] + hora_num) % 7
+    return (
+        WEEKDAY_LORDS[year_num],
+        WEEKDAY_LORDS[month_num],
+        WEEKDAY_LORDS[weekday],
+        WEEKDAY_LORDS[HORA_SEQUENCE[current_idx]],
+    )
+
+
+def _kala_chart_inputs(
+    sun_lon: float, moon_lon: float, birth_hour: float, sunrise: float = 6.0, sunset: float = 18.0
+) -> Tuple[float, float, Optional[str]]:
+    """
+    Chart-wide inputs shared by every planet's Kala Bala, computed once per chart:
+    (lunar phase angle, hours from midnight, lord of the current tribhaga).
+    """
+    # Calculate tithi (lunar day)
+    phase = norm_deg(moon_lon - sun_lon)
+
+    # 0 = midnight, 12 = noon
+    hour_from_midnight = birth_hour if birth_hour < 12 else 24 - birth_hour
+
+    day_length = sunset - sunrise
+    night_length = 24 - day_length
+
+    if sunrise <= birth_hour < sunset:  # Daytime
+        time_in_day = birth_hour - sunrise
+        part = int(time_in_day / (day_length / 3))
+        lords = TRIBHAGA_DAY_LORDS
+    else:  # Nighttime
+        if birth_hour >= sunset:
+            time_in_night = birth_hour - sunset
         else:
-            # Faster than average - weaker
-            return max(0.0, 30.0 - (speed_ratio - 1.0) * 15)
+            time_in_night = birth_hour + (24 - sunset)
+        part = int(time_in_night / (night_length / 3))
+        lords = TRIBHAGA_NIGHT_LORDS
+    tribhaga_lord = lords[part] if 0 <= part < 3 else None
 
-    # ==================== NAISARGIKA BALA ====================
+    return phase, hour_from_midnight, tribhaga_lord
 
-    def naisargika_bala(planet_name: str) -> float:
-        """Natural strength - fixed values based on luminosity."""
-        return NAISARGIKA_BALA.get(planet_name, 8.57)
 
-    # ==================== DRIK BALA ====================
+def _divaratri_bala(planet_name: str, hour_from_midnight: float) -> float:
+    """
+    Day/Night strength.
+    Moon, Saturn, Mars: strong at midnight (60), weak at noon (0)
+    Sun, Jupiter, Venus: strong at noon (60), weak at midnight (0)
+    Mercury: always 60
+    """
+    if planet_name == "Mercury":
+        return 60.0
 
-    def get_aspect_strength(angle: float) -> float:
-        """
-        Get aspect strength with partial aspects.
-        180° = 100% (60), 120° = 50% (30), 90° = 75% (45), 60° = 25% (15)
-        """
-        angle = abs(angle)
-        if angle > 180:
-            angle = 360 - angle
-        
-        # Full aspect at 180°
-        if 175 <= angle <= 185:
-            return 60.0
-        # Trine aspect at 120°
-        elif 115 <= angle <= 125:
-            return 30.0
-        # Square aspect at 90°
-        elif 85 <= angle <= 95:
-            return 45.0
-        # Sextile aspect at 60°
-        elif 55 <= angle <= 65:
-            return 15.0
-        # Interpolate for other angles
-        elif 65 < angle < 85:
-            return 15.0 + (angle - 65) * (45.0 - 15.0) / 20
-        elif 95 < angle < 115:
-            return 45.0 - (angle - 95) * (45.0 - 30.0) / 20
-        elif 125 < angle < 175:
-            return 30.0 + (angle - 125) * (60.0 - 30.0) / 50
-        
+    if planet_name in NIGHT_STRONG_PLANETS:
+        # Strong at midnight, weak at noon
+        return (12 - abs(hour_from_midnight)) * 5
+    elif planet_name in DAY_STRONG_PLANETS:
+        # Strong at noon, weak at midnight
+        return abs(hour_from_midnight) * 5
+    return 30.0
+
+
+def _paksha_bala(planet_name: str, phase: float) -> float:
+    """
+    Lunar phase strength.
+    Benefics (Jupiter, Venus, Moon, Mercury): strong in Shukla Paksha (waxing)
+    Malefics (Sun, Mars, Saturn): strong in Krishna Paksha (waning)
+    Moon's paksha bala is doubled.
+    """
+    if planet_name in BENEFICS:
+        bala = phase / 3.0  # Max 60 at full moon
+    else:
+        bala = (180.0 - min(phase, 360 - phase)) / 3.0
+
+    # Double Moon's paksha bala
+    if planet_name == "Moon":
+        bala *= 2.0
+
+    return min(60.0, bala)
+
+
+def _tribhaga_bala(planet_name: str, tribhaga_lord: Optional[str]) -> float:
+    """
+    Three-part day/night strength.
+    Jupiter always gets 60.
+    Day: 1st part=Mercury, 2nd part=Sun, 3rd part=Saturn
+    Night: 1st part=Moon, 2nd part=Venus, 3rd part=Mars
+    """
+    if planet_name == "Jupiter" or planet_name == tribhaga_lord:
+        return 60.0
+    return 0.0
+
+
+def _ayana_declinations(longitudes: Sequence[float]) -> List[float]:
+    """
+    Approximate declination of each longitude, for Ayana Bala.
+    Using simplified formula: decl = 23.45 * sin(longitude)
+    """
+    sin, radians = math.sin, math.radians
+    return [23.45 * sin(radians(lon)) for lon in longitudes]
+
+
+def _ayana_bala(planet_name: str, decl: float) -> float:
+    """
+    Declination-based strength.
+    Northern declination favors Sun, Mars, Jupiter, Venus, Mercury.
+    Southern declination favors Moon, Saturn.
+    Sun's ayana bala is doubled.
+    `decl` comes from _ayana_declinations().
+    """
+    if planet_name in NORTH_AYANA_PLANETS:
+        bala = 30.0 + (decl * 30.0 / 23.45)
+    else:
+        bala = 30.0 - (decl * 30.0 / 23.45)
+
+    # Double Sun's ayana bala
+    if planet_name == "Sun":
+        bala *= 2.0
+
+    return max(0.0, min(60.0, bala))
+
+
+def _calc_kala_bala(
+    planet_name: str,
+    declination: float,
+    kala_inputs: Tuple[float, float, Optional[str]],
+    time_lords: Tuple[str, str, str, str],
+) -> Dict:
+    """
+    Calculate total Kala Bala with all components (classical, no capping).
+    `kala_inputs` and `time_lords` come from _kala_chart_inputs() and
+    _time_lords() for the chart.
+    """
+    phase, hour_from_midnight, tribhaga_lord = kala_inputs
+    year_lord, month_lord, weekday_lord, hora_lord = time_lords
+    divaratri = _divaratri_bala(planet_name, hour_from_midnight)
+    paksha = _paksha_bala(planet_name, phase)
+    tribhaga = _tribhaga_bala(planet_name, tribhaga_lord)
+    abda = 15.0 if planet_name == year_lord else 0.0  # Year lord
+    masa = 30.0 if planet_name == month_lord else 0.0  # Month lord
+    vara = 45.0 if planet_name == weekday_lord else 0.0  # Weekday lord
+    hora = 60.0 if planet_name == hora_lord else 0.0  # Hora lord
+    ayana = _ayana_bala(planet_name, declination)
+
+    total = divaratri + paksha + tribhaga + abda + masa + vara + hora + ayana
+
+    # Tribhaga and the four time-lord balas are fixed values that need no rounding
+    return {
+        "divaratri": round(divaratri, 2),
+        "paksha": round(paksha, 2),
+        "tribhaga": tribhaga,
+        "abda": abda,
+        "masa": masa,
+        "vara": vara,
+        "hora": hora,
+        "ayana": round(ayana, 2),
+        "total": round(total, 2),
+    }
+
+
+# ==================== CHESTA BALA ====================
+
+
+def _chesta_bala(planet_name: str, speed: float, is_retrograde: bool) -> float:
+    """
+    Motional strength based on relative speed.
+    Retrograde planets get high chesta bala (up to 60).
+    Sun and Moon don't get chesta bala.
+    """
+    # Nodes (Rahu/Ketu) don't use classical Chesta Bala in this simplified model
+    if planet_name in NO_CHESTA_PLANETS:
         return 0.0
 
-    def drik_bala(planet_name: str, planet_lon: float, all_planets: Dict) -> float:
-        """
-        Aspectual strength.
-        Positive if aspected by benefics, negative if by malefics.
-        """
-        benefics = ("Jupiter", "Venus", "Mercury", "Moon")
-        malefics = ("Sun", "Mars", "Saturn", "Rahu")
-        
-        total = 0.0
-        for other_name, other_data in all_planets.items():
-            if other_name == planet_name or other_name == "Ketu":
-                continue
-            
-            other_lon = float(other_data.get("longitude", 0.0))
-            angle = angular_distance(planet_lon, other_lon)
-            aspect_strength = get_aspect_strength(angle)
-            
+    avg_speed = AVERAGE_SPEED.get(planet_name, 1.0)
+    if avg_speed == 0:
+        return 30.0
+
+    # Relative speed ratio
+    speed_ratio = abs(speed) / avg_speed
+
+    if is_retrograde:
+        # Retrograde planets are considered strong
+        return 60.0
+    elif speed_ratio < 0.5:
+        # Very slow (almost stationary) - strong
+        return 45.0 + (0.5 - speed_ratio) * 30
+    elif speed_ratio < 1.0:
+        # Slower than average
+        return 30.0 + (1.0 - speed_ratio) * 30
+    else:
+        # Faster than average - weaker
+        return max(0.0, 30.0 - (speed_ratio - 1.0) * 15)
+
+
+# ==================== DRIK BALA ====================
+
+
+def _get_aspect_strength(angle: float, _abs=abs, _bisect=bisect_right) -> float:
+    """
+    Get aspect strength with partial aspects.
+    180° = 100% (60), 120° = 50% (30), 90° = 75% (45), 60° = 25% (15)
+    Piecewise linear over ASPECT_SEGMENTS, located with a bisect.
+    """
+    angle = _abs(angle)
+    if angle > 180:
+        angle = 360 - angle
+
+    base_y, base_x, rise, run = ASPECT_SEGMENTS[_bisect(ASPECT_BREAKS, angle)]
+    if not rise:
+        return base_y
+    return base_y + (angle - base_x) * rise / run
+
+
+def _drik_bala_all(all_planets: Dict[str, tuple]) -> List[float]:
+    """
+    Aspectual strength for every planet, aligned with `all_planets["name"]`.
+    Positive if aspected by benefics, negative if by malefics.
+    `all_planets` is the planet_columns() view of the chart.
+
+    Aspect strength is symmetric, so each pair is evaluated once and credited
+    to both planets. Walking pairs (i, j) with i < j adds each planet's terms
+    in ascending order of the other planet, the same order as a per-planet
+    loop, so the float sums are unchanged.
+    """
+    names = all_planets["name"]
+    lons = all_planets["longitude"]
+    n = len(names)
+    natures = [DRIK_NATURE.get(name, 0) for name in names]
+
+    # Local names for the pair loop's helpers avoid repeated global lookups
+    aspect_strength_of = _get_aspect_strength
+    distance = angular_distance
+
+    totals = [0.0] * n
+    for i in range(n):
+        lon_i = lons[i]
+        nature_i = natures[i]
+        for j in range(i + 1, n):
+            nature_j = natures[j]
+            if not (nature_i or nature_j):
+                continue  # neither planet casts a counted aspect
+            aspect_strength = aspect_strength_of(distance(lon_i, lons[j]))
             if aspect_strength > 0:
-                if other_name in benefics:
-                    total += aspect_strength / 4
-                elif other_name in malefics:
-                    total -= aspect_strength / 4
-        
-        return total
+                if nature_j > 0:
+                    totals[i] += aspect_strength / 4
+                elif nature_j < 0:
+                    totals[i] -= aspect_strength / 4
+                if nature_i > 0:
+                    totals[j] += aspect_strength / 4
+                elif nature_i < 0:
+                    totals[j] -= aspect_strength / 4
+
+    return totals
 
-    # ==================== MAIN CALCULATION ====================
 
-    sun_lon = float(planets_out.get("Sun", {}).get("longitude", 0.0))
-    moon_lon = float(planets_out.get("Moon", {}).get("longitude", 0.0))
+@lru_cache(maxsize=256, typed=True)
+def _shad_bala_cached(
+    planet_rows: Tuple[Tuple[str, float, float, bool, int], ...],
+    lagna_longitude: float,
+    jd_ut: float,
+    birth_hour: float,
+) -> Dict:
+    """
+    Shad Bala for one chart, memoized on everything the calculation reads.
+    `planet_rows` holds (name, longitude, speed, retrograde, house) per planet,
+    in chart order. The returned dicts are shared between hits, so callers
+    must copy them (see calculate_shad_bala).
+    """
+    shad_bala: Dict[str, Dict] = {}
 
-    for planet_name, planet_data in planets_out.items():
+    # Classical Shadbala does not cap component values - they sum naturally
+    # Typical ranges (for reference only, not used for capping):
+    # - Sthana Bala: 100-250+ virupa
+    # - Dig Bala: 0-60 virupa
+    # - Kala Bala: 50-200+ virupa
+    # - Chesta Bala: 0-60 virupa
+    # - Naisargika Bala: 8.57-60 virupa (fixed)
+    # - Drik Bala: can be positive or negative
 
-        planet_lon = float(planet_data.get("longitude", 0.0))
-        planet_speed = float(planet_data.get("speed", 0.0)) if "speed" in planet_data else 0.0
-        is_retrograde = bool(planet_data.get("retrograde", False))
-        house = int(planet_data.get("house_whole_sign", 1))
+    # ==================== MAIN CALCULATION ====================
 
-        # Calculate all components
-        sthana = calc_sthana_bala(planet_name, planet_lon, house)
-        dig = dig_bala(planet_name, planet_lon)
-        kala = calc_kala_bala(planet_name, planet_lon, sun_lon, moon_lon, jd_ut, birth_hour, latitude, longitude)
-        chesta = chesta_bala(planet_name, planet_speed, is_retrograde)
-        naisargika = naisargika_bala(planet_name)
-        drik = drik_bala(planet_name, planet_lon, planets_out)
+    # Rebuild the column view from the cache key's rows
+    names, lons, speeds, retrogrades, houses = zip(*planet_rows) if planet_rows else ((),) * 5
+    columns = {"name": names, "longitude": lons, "speed": speeds, "retrograde": retrogrades, "house": houses}
+    lon_by_name = dict(zip(names, lons))
+    # Sun/Moon phase, time of day and tribhaga are the same for every planet
+    kala_inputs = _kala_chart_inputs(lon_by_name.get("Sun", 0.0), lon_by_name.get("Moon", 0.0), birth_hour)
+    time_lords = _time_lords(jd_ut, birth_hour)
+
+    # Components that only need a column or two are computed for all planets
+    # up front; Sthana and Kala (which produce sub-dicts) run per planet below
+    dig_column = _dig_bala_all(names, lons, lagna_longitude)
+    chesta_column = [_chesta_bala(*args) for args in zip(names, speeds, retrogrades)]
+    naisargika_column = [NAISARGIKA_BALA.get(planet_name, 8.57) for planet_name in names]
+    drik_column = _drik_bala_all(columns)
+    declinations = _ayana_declinations(lons)
+
+    for planet_name, planet_lon, house, dig, chesta, naisargika, drik, declination in zip(
+        names, lons, houses, dig_column, chesta_column, naisargika_column, drik_column, declinations,
+    ):
+        sthana = _calc_sthana_bala(planet_name, planet_lon, house)
+        kala = _calc_kala_bala(planet_name, declination, kala_inputs, time_lords)
 
         # Total in Shashtiamsas
         total_shashtiamsas = sthana["total"] + dig + kala["total"] + chesta + naisargika + drik
@@ -1718,8 +1831,7 @@ def calculate_shad_bala(
         # prevents inflated totals, so avoid additional global scaling.
         total_rupas = (total_shashtiamsas / 60.0)
 
-        required = REQUIRED_STRENGTH.get(planet_name, 300)
-        required_rupas = required / 60.0
+        required_rupas = REQUIRED_RUPAS.get(planet_name, 5.0)
         ratio = total_rupas / required_rupas if required_rupas > 0 else 0
 
         # Match frontend thresholds: Strong ≥120%, Medium ≥90%, Weak <90%
@@ -1735,11 +1847,11 @@ def calculate_shad_bala(
             "dig_bala": round(dig, 2),
             "kala_bala": kala,
             "chesta_bala": round(chesta, 2),
-            "naisargika_bala": round(naisargika, 2),
+            "naisargika_bala": naisargika,  # table value, already 2 decimals
             "drik_bala": round(drik, 2),
             "total_shashtiamsas": round(total_shashtiamsas, 2),
             "total_rupas": round(total_rupas, 2),
-            "required_rupas": round(required_rupas, 2),
+            "required_rupas": required_rupas,  # whole or half Rupas
             "ratio": round(ratio, 2),
             # Keep consistent with strength thresholds used by frontend
             "is_strong": ratio >= 1.20,
@@ -1749,28 +1861,100 @@ def calculate_shad_bala(
     return shad_bala
 
 
+
+
+def calculate_shad_bala(
+    planets_out: Dict,
+    lagna_sign: int,
+    lagna_longitude: float,
+    jd_ut: float,
+    birth_hour: float,
+    latitude: float,
+    longitude: float,
+) -> Dict:
+    """
+    Calculate Shad Bala (sixfold strength) for planets following AstroSage/B.V. Raman methodology.
+    
+    Traditional Shad Bala components:
+    1. Sthana Bala - Positional strength (5 sub-components)
+       - Uccha Bala (exaltation strength)
+       - Saptavargaja Bala (7 divisional chart strength)
+       - Ojayugma Bala (odd/even sign strength)
+       - Kendra Bala (angular house strength)
+       - Drekkana Bala (decanate strength)
+    2. Dig Bala - Directional strength
+    3. Kala Bala - Temporal strength (9 sub-components)
+       - Divaratri Bala (day/night strength)
+       - Paksha Bala (lunar phase strength)
+       - Tribhaga Bala (three-part day/night strength)
+       - Abda Bala (year lord strength)
+       - Masa Bala (month lord strength)
+       - Vara Bala (weekday lord strength)
+       - Hora Bala (hour lord strength)
+       - Ayana Bala (declination strength)
+       - Yuddha Bala (planetary war strength)
+    4. Chesta Bala - Motional strength (based on relative speed)
+    5. Naisargika Bala - Natural strength (fixed values)
+    6. Drik Bala - Aspectual strength (with partial aspects)
+    """
+    # Only these per-planet fields feed the calculation. As a hashable key
+    # they let repeat charts (re-renders, sweeps) skip the whole computation.
+    columns = planet_columns(planets_out)
+    planet_rows = tuple(zip(
+        columns["name"], columns["longitude"], columns["speed"], columns["retrograde"], columns["house"],
+    ))
+    cached = _shad_bala_cached(planet_rows, lagna_longitude, jd_ut, birth_hour)
+
+    # Copy so callers can't mutate the cached result
+    return {
+        name: {**bala, "sthana_bala": dict(bala["sthana_bala"]), "kala_bala": dict(bala["kala_bala"])}
+        for name, bala in cached.items()
+    }
+
+
+def _period_dates(start: datetime, end: datetime) -> Dict:
+    """Start/end fields shared by Mahadasha and Antardasha period entries.
+
+    Dates are formatted from the already-extracted parts; the year is left
+    unpadded to match strftime("%Y-%m-%d").
+    """
+    start_year, start_month, start_day = start.year, start.month, start.day
+    end_year, end_month, end_day = end.year, end.month, end.day
+    return {
+        "start_datetime": start.isoformat(),
+        "start_date": f"{start_year}-{start_month:02d}-{start_day:02d}",
+        "start_year": start_year,
+        "start_month": start_month,
+        "start_day": start_day,
+        "end_datetime": end.isoformat(),
+        "end_date": f"{end_year}-{end_month:02d}-{end_day:02d}",
+        "end_year": end_year,
+        "end_month": end_month,
+        "end_day": end_day,
+    }
+
+
 def calculate_vimshottari_dasha(moon_longitude: float, birth_datetime: datetime) -> Dict:
     """
     Calculate Vimshottari Dasha periods based on Moon's nakshatra position.
     Returns dict with dasha periods and their start/end dates.
     """
+    return _vimshottari_dasha(moon_longitude, birth_datetime)[0]
+
+
+def _vimshottari_dasha(moon_longitude: float, birth_datetime: datetime) -> Tuple[Dict, List[datetime]]:
+    """calculate_vimshottari_dasha() plus the start datetime of each period."""
     # Get nakshatra from Moon longitude (27 nakshatras, each 13°20')
-    nakshatra_index = int(moon_longitude / (360 / 27))  # 0-26
-    
-    # Map nakshatra to dasha lord (correct mapping based on Ashwini = Ketu)
-    # Each nakshatra is 13°20' (800 minutes)
-    nakshatra_lords = [
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",  # 1-9: Ashwini to Ashlesha
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",  # 10-18: Magha to Jyeshtha
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",  # 19-27: Mula to Revati
-    ]
+    nakshatra_index = int(moon_longitude / NAKSHATRA_SPAN)  # 0-26
     
-    # Get the starting dasha lord
-    current_dasha_lord = nakshatra_lords[nakshatra_index]
+    # Nakshatra lords repeat the Vimshottari order every 9 nakshatras
+    # (Ashwini = Ketu), so the lord's position in DASHA_ORDER is index % 9
+    current_index = nakshatra_index % 9
+    current_dasha_lord = DASHA_ORDER[current_index]
     
     # Calculate how much of the current dasha period has passed
-    nakshatra_degree = moon_longitude % (360 / 27)  # 0-13.333°
-    nakshatra_portion = nakshatra_degree / (360 / 27)  # 0-1 within the nakshatra
+    nakshatra_degree = moon_longitude % NAKSHATRA_SPAN  # 0-13.333°
+    nakshatra_portion = nakshatra_degree / NAKSHATRA_SPAN  # 0-1 within the nakshatra
     
     total_dasha_years = DASHA_PERIODS[current_dasha_lord]
     years_passed = total_dasha_years * nakshatra_portion
@@ -1782,20 +1966,12 @@ def calculate_vimshottari_dasha(moon_longitude: float, birth_datetime: datetime)
 
     # Current Mahadasha at birth is usually a partial segment (remaining only)
     segment_start = birth_datetime
-    segment_end = birth_datetime + timedelta(days=years_remaining * 365.25)
+    segment_end = birth_datetime + _years_span(years_remaining)
+    period_starts = [segment_start]
 
     dasha_periods.append({
         "planet": current_dasha_lord,
-        "start_datetime": segment_start.isoformat(),
-        "start_date": segment_start.strftime("%Y-%m-%d"),
-        "start_year": segment_start.year,
-        "start_month": segment_start.month,
-        "start_day": segment_start.day,
-        "end_datetime": segment_end.isoformat(),
-        "end_date": segment_end.strftime("%Y-%m-%d"),
-        "end_year": segment_end.year,
-        "end_month": segment_end.month,
-        "end_day": segment_end.day,
+        **_period_dates(segment_start, segment_end),
         "years": round(years_remaining, 6),
         "total_years": total_dasha_years,
         "years_passed": round(years_passed, 6),
@@ -1803,32 +1979,23 @@ def calculate_vimshottari_dasha(moon_longitude: float, birth_datetime: datetime)
     })
     
     # Add remaining dasha periods in order
-    current_index = DASHA_ORDER.index(current_dasha_lord)
     end_date = segment_end
     
     for i in range(1, 9):  # 8 more dashas to complete 120 years
         next_index = (current_index + i) % 9
         planet = DASHA_ORDER[next_index]
-        years = DASHA_PERIODS[planet]
+        years = DASHA_YEARS[next_index]
         
-        next_end_date = end_date + timedelta(days=years * 365.25)
+        next_end_date = end_date + DASHA_SPANS[next_index]
         dasha_periods.append({
             "planet": planet,
-            "start_datetime": end_date.isoformat(),
-            "start_date": end_date.strftime("%Y-%m-%d"),
-            "start_year": end_date.year,
-            "start_month": end_date.month,
-            "start_day": end_date.day,
-            "end_datetime": next_end_date.isoformat(),
-            "end_date": next_end_date.strftime("%Y-%m-%d"),
-            "end_year": next_end_date.year,
-            "end_month": next_end_date.month,
-            "end_day": next_end_date.day,
+            **_period_dates(end_date, next_end_date),
             "years": round(years, 6),
             "total_years": years,
             "years_passed": 0.0,
             "is_current": False,
         })
+        period_starts.append(end_date)
         
         end_date = next_end_date
     
@@ -1838,7 +2005,7 @@ def calculate_vimshottari_dasha(moon_longitude: float, birth_datetime: datetime)
         "moon_nakshatra_name": get_nakshatra_name(nakshatra_index),
         "moon_nakshatra_pada": int(nakshatra_portion * 4) + 1,  # 1-4
         "periods": dasha_periods,
-    }
+    }, period_starts
 
 
 def calculate_antardashas(dasha_planet: str, dasha_start_date: datetime, dasha_years: float) -> List[Dict]:
@@ -1852,228 +2019,136 @@ def calculate_antardashas(dasha_planet: str, dasha_start_date: datetime, dasha_y
     """
     antardashas = []
     segment_start = dasha_start_date
-    segment_end = dasha_start_date + timedelta(days=dasha_years * 365.25)
+    segment_end = dasha_start_date + _years_span(dasha_years)
     current_date = segment_start
 
     mahadasha_full_years = DASHA_PERIODS[dasha_planet]
     elapsed_years = max(0.0, mahadasha_full_years - dasha_years)
 
-    start_index = DASHA_ORDER.index(dasha_planet)
-
-    # Build full antardasha sequence durations for the Mahadasha
-    full_seq: List[Dict] = []
-    for i in range(9):
-        planet = DASHA_ORDER[(start_index + i) % 9]
-        ant_years = (mahadasha_full_years * DASHA_PERIODS[planet]) / VIMSHOTTARI_CYCLE
-        full_seq.append({"planet": planet, "years": ant_years})
+    # Full antardasha sequence durations for the Mahadasha
+    full_seq = ANTARDASHA_TABLE[dasha_planet]
 
-    # Skip elapsed antardasha time to align to segment_start
+    # Skip elapsed antardasha time to align to segment_start. Only the
+    # Mahadasha running at birth has elapsed time; later ones start at idx 0.
     remaining_to_skip = elapsed_years
     idx = 0
-    while idx < len(full_seq) and remaining_to_skip > 1e-12:
-        d = full_seq[idx]["years"]
-        if remaining_to_skip >= d - 1e-12:
+    if remaining_to_skip > 1e-12:
+        for _, d, _, _ in full_seq:
+            if remaining_to_skip < d - 1e-12:
+                break
             remaining_to_skip -= d
             idx += 1
-        else:
-            break
+            if remaining_to_skip <= 1e-12:
+                break
 
     # If we are inside an antardasha, first entry is the remaining portion
     if idx < len(full_seq) and remaining_to_skip > 1e-12:
-        planet = full_seq[idx]["planet"]
-        remaining_years = full_seq[idx]["years"] - remaining_to_skip
-        end_date = current_date + timedelta(days=remaining_years * 365.25)
+        planet, ant_years, _, _ = full_seq[idx]
+        remaining_years = ant_years - remaining_to_skip
+        end_date = current_date + _years_span(remaining_years)
         if end_date > segment_end:
             end_date = segment_end
         antardashas.append({
             "planet": planet,
-            "start_datetime": current_date.isoformat(),
-            "start_date": current_date.strftime("%Y-%m-%d"),
-            "start_year": current_date.year,
-            "start_month": current_date.month,
-            "start_day": current_date.day,
-            "end_datetime": end_date.isoformat(),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "end_year": end_date.year,
-            "end_month": end_date.month,
-            "end_day": end_date.day,
-            "years": round((end_date - current_date).total_seconds() / (365.25 * 24 * 3600), 6),
+            **_period_dates(current_date, end_date),
+            "years": _span_years(end_date - current_date),
         })
         current_date = end_date
         idx += 1
 
     # Add subsequent full antardashas until we reach segment_end
-    while idx < len(full_seq) and current_date < segment_end:
-        planet = full_seq[idx]["planet"]
-        d_years = full_seq[idx]["years"]
-        end_date = current_date + timedelta(days=d_years * 365.25)
+    for planet, _, span, years in full_seq[idx:]:
+        if current_date >= segment_end:
+            break
+        end_date = current_date + span
         if end_date > segment_end:
             end_date = segment_end
+            years = _span_years(end_date - current_date)
         antardashas.append({
             "planet": planet,
-            "start_datetime": current_date.isoformat(),
-            "start_date": current_date.strftime("%Y-%m-%d"),
-            "start_year": current_date.year,
-            "start_month": current_date.month,
-            "start_day": current_date.day,
-            "end_datetime": end_date.isoformat(),
-            "end_date": end_date.strftime("%Y-%m-%d"),
-            "end_year": end_date.year,
-            "end_month": end_date.month,
-            "end_day": end_date.day,
-            "years": round((end_date - current_date).total_seconds() / (365.25 * 24 * 3600), 6),
+            **_period_dates(current_date, end_date),
+            "years": years,
         })
         current_date = end_date
-        idx += 1
-    
+
     return antardashas
 
 
 def get_nakshatra_name(index: int) -> str:
     """Get nakshatra name by index (0-26)."""
-    nakshatras = [
-        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashirsha", "Ardra", "Punarvasu",
-        "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra",
-        "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha", "Uttara Ashadha",
-        "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-    ]
-    return nakshatras[index] if 0 <= index < len(nakshatras) else "Unknown"
-
-
-def kundali(b: BirthInput) -> Dict:
-    swe.set_ephe_path(b.ephe_path)
-    swe.set_sid_mode(b.ayanamsha, 0, 0)
-
-    # DST handling is only for converting local civil time -> UT (Julian day).
-    # Kala Bala and Dasha must use LOCAL civil time at birthplace, not IST.
-    original_tz_offset = b.tz_offset_hours
-    adjusted_tz_offset = adjust_for_dst(b.year, b.month, b.day, b.latitude, b.longitude, original_tz_offset)
-    dst_applied = adjusted_tz_offset != original_tz_offset
-    dst_adjustment = adjusted_tz_offset - original_tz_offset
-
-    # For UI/debug only: also compute IST equivalent of the entered local time.
-    ist_time = convert_to_ist(
-        b.year, b.month, b.day, b.hour, b.minute, b.second,
-        b.tz_offset_hours, b.latitude, b.longitude
-    )
+    return NAKSHATRAS[index] if 0 <= index < 27 else "Unknown"
 
-    jd_ut = compute_julian_day_local(b, adjusted_tz_offset)
 
-    flags = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
-
-    ay = swe.get_ayanamsa(jd_ut)
-    asc_trop = compute_lagna(jd_ut, b.latitude, b.longitude)
-    asc_sid = norm_deg(asc_trop - ay)
+def _compute_planets(jd_ut: float, lagna_sign: int, sid_mode: int) -> Dict[str, Dict]:
+    """
+    Sidereal planet positions (plus Ketu) with house, navamsa and combustion flags.
 
-    lagna_sign = deg_to_sign_index(asc_sid)
-    lagna_sign_name, ld, lm, ls = deg_to_sign_deg(asc_sid)
+    `sid_mode` must be the mode currently set via set_sid_mode().
+    """
+    # (longitude, speed, retrograde) per body
+    rows = [
+        (norm_deg(result[0]), result[3], result[3] < 0)
+        for result in _calc_planets_cached(jd_ut, sid_mode)
+    ]
+    # Ketu = Rahu + 180, taken from Rahu's reported (rounded) values
+    rahu_lon, rahu_speed, rahu_retro = rows[_RAHU_ROW]
+    rows.append((norm_deg(round(rahu_lon, 4) + 180.0), round(rahu_speed, 6), rahu_retro))
 
     planets_out: Dict[str, Dict] = {}
-
-    # First pass: basic planet data
-    for name, p in PLANETS.items():
-        result, _ = swe.calc_ut(jd_ut, p, flags)
-        lon = norm_deg(result[0])
-        lon_speed = result[3]
-        retro = lon_speed < 0
-
-        sign_idx = deg_to_sign_index(lon)
-        sign_name, d, m, s = deg_to_sign_deg(lon)
-        house = whole_sign_house(lagna_sign, sign_idx)
-        navamsa_sign = get_navamsa_sign(lon)
+    navamsa_span = 30.0 / 9.0
+    sun_lon = 0.0  # set on the first iteration; PLANETS starts with the Sun
+    signs, signs_sanskrit, navamsa_start = SIGNS, SIGNS_SANSKRIT, _NAVAMSA_START
+
+    # sign_parts, whole_sign_house and _navamsa_index are inlined so each
+    # longitude is split only once.
+    for (name, symbol, exalted_sign, debilitated_sign), (lon, lon_speed, retro) in zip(PLANET_STATIC, rows):
+        sign_idx = int(lon // 30)
+        within = lon - 30 * sign_idx
+        d = int(within)
+        m_float = (within - d) * 60
+        m = int(m_float)
+        s = (m_float - m) * 60
+        house = (sign_idx - lagna_sign) % 12 + 1
+        navamsa_sign = (navamsa_start[sign_idx & 3] + int(within / navamsa_span)) % 12
+
+        # Combustion compares the rounded longitudes that are reported
+        lon_out = round(lon, 4)
+        if name == "Sun":
+            sun_lon = lon_out
+            combust = False
+        else:
+            combust = is_combust(name, lon_out, sun_lon, retro)
 
         planets_out[name] = {
-            "longitude": round(lon, 4),
+            "longitude": lon_out,
             "speed": round(lon_speed, 6),  # Daily motion in degrees for Chesta Bala
-            "sign": sign_name,
-            "sign_sanskrit": SIGNS_SANSKRIT[sign_idx],
+            "sign": signs[sign_idx],
+            "sign_sanskrit": signs_sanskrit[sign_idx],
             "sign_index": sign_idx,
             "navamsa_sign_index": navamsa_sign,
-            "navamsa_sign": SIGNS[navamsa_sign],
-            "navamsa_sign_sanskrit": SIGNS_SANSKRIT[navamsa_sign],
+            "navamsa_sign": signs[navamsa_sign],
+            "navamsa_sign_sanskrit": signs_sanskrit[navamsa_sign],
             "deg": d,
             "min": m,
             "sec": round(s, 2),
             "house_whole_sign": house,
             "retrograde": retro,
-            "symbol": PLANET_SYMBOLS[name],
-            "exalted": sign_idx == EXALTATION.get(name),
-            "debilitated": sign_idx == DEBILITATION.get(name),
+            "symbol": symbol,
+            "exalted": sign_idx == exalted_sign,
+            "debilitated": sign_idx == debilitated_sign,
             "vargottama": sign_idx == navamsa_sign,
-            "combust": False,
+            "combust": combust,
         }
 
-    # Second pass: combustion (needs Sun longitude)
-    sun_lon = float(planets_out["Sun"]["longitude"])
-    for name in list(planets_out.keys()):
-        if name == "Sun":
-            continue
-        planets_out[name]["combust"] = is_combust(
-            name,
-            float(planets_out[name]["longitude"]),
-            sun_lon,
-            bool(planets_out[name]["retrograde"]),
-        )
-
-    # Ketu = Rahu + 180
-    rahu_lon = float(planets_out["Rahu"]["longitude"])
-    ketu_lon = norm_deg(rahu_lon + 180.0)
-    ketu_sign_idx = deg_to_sign_index(ketu_lon)
-    ketu_sign_name, kd, km, ks = deg_to_sign_deg(ketu_lon)
-    ketu_house = whole_sign_house(lagna_sign, ketu_sign_idx)
-    ketu_navamsa_sign = get_navamsa_sign(ketu_lon)
-
-    planets_out["Ketu"] = {
-        "longitude": round(ketu_lon, 4),
-        "speed": planets_out["Rahu"].get("speed", 0.0),  # Same speed as Rahu
-        "sign": ketu_sign_name,
-        "sign_sanskrit": SIGNS_SANSKRIT[ketu_sign_idx],
-        "sign_index": ketu_sign_idx,
-        "navamsa_sign_index": ketu_navamsa_sign,
-        "navamsa_sign": SIGNS[ketu_navamsa_sign],
-        "navamsa_sign_sanskrit": SIGNS_SANSKRIT[ketu_navamsa_sign],
-        "deg": kd,
-        "min": km,
-        "sec": round(ks, 2),
-        "house_whole_sign": ketu_house,
-        "retrograde": planets_out["Rahu"].get("retrograde", False),
-        "symbol": PLANET_SYMBOLS["Ketu"],
-        "exalted": ketu_sign_idx == EXALTATION.get("Ketu"),
-        "debilitated": ketu_sign_idx == DEBILITATION.get("Ketu"),
-        "vargottama": ketu_sign_idx == ketu_navamsa_sign,
-        "combust": False,
-    }
+    return planets_out
 
-    # Calculate Upagrahas
-    upagrahas = calculate_upagrahas(sun_lon, jd_ut, b.latitude, b.longitude)
-    
-    # Add house info to upagrahas
-    for uname, uinfo in upagrahas.items():
-        uinfo["house_whole_sign"] = whole_sign_house(lagna_sign, int(uinfo["sign_index"]))
 
-    # Build rasi chart
-    rasi_chart: Dict[int, List[str]] = {i: [] for i in range(12)}
-    for pname, info in planets_out.items():
-        rasi_chart[int(info["sign_index"])].append(pname)
-    # Add upagrahas to rasi chart
-    for uname, uinfo in upagrahas.items():
-        rasi_chart[int(uinfo["sign_index"])].append(uname)
-    rasi_chart[lagna_sign].insert(0, "Asc")
-
-    # Build Navamsa (D9) chart
-    navamsa_chart: Dict[int, List[str]] = {i: [] for i in range(12)}
-    for pname, info in planets_out.items():
-        nav_sign_idx = int(info.get("navamsa_sign_index", 0))
-        navamsa_chart[nav_sign_idx].append(pname)
-    # Add upagrahas to navamsa chart
-    for uname, uinfo in upagrahas.items():
-        nav_sign_idx = int(uinfo.get("navamsa_sign_index", 0))
-        navamsa_chart[nav_sign_idx].append(uname)
-    nav_asc_sign = get_navamsa_sign(asc_sid)
-    navamsa_chart[nav_asc_sign].insert(0, "Asc")
+def _local_birth_time(b: BirthInput, adjusted_tz_offset: float) -> Tuple[float, datetime]:
+    """
+    Birth time as LOCAL civil time at the birthplace: (decimal hour, datetime).
 
-    # Kala Bala depends on LOCAL civil time at birthplace.
-    # If the request is in UTC, convert UTC -> local using DST-adjusted offset.
+    If the request is in UTC, convert UTC -> local using the DST-adjusted offset.
+    """
     if getattr(b, "use_utc", False):
         local_birth = utc_to_local(
             year=b.year,
@@ -2099,6 +2174,164 @@ def kundali(b: BirthInput) -> Dict:
         birth_hour_local = b.hour + b.minute / 60.0 + b.second / 3600.0
         birth_datetime_local = datetime(b.year, b.month, b.day, b.hour, b.minute, b.second)
 
+    return birth_hour_local, birth_datetime_local
+
+
+def _prepare_chart(b: BirthInput) -> Tuple[float, float, float]:
+    """
+    Configure Swiss Ephemeris for `b` and return (adjusted_tz_offset, jd_ut, sidereal Asc).
+
+    DST handling is only for converting local civil time -> UT (Julian day).
+    """
+    set_ephe_path(b.ephe_path)
+    set_sid_mode(b.ayanamsha)
+
+    adjusted_tz_offset = adjust_for_dst(b.year, b.month, b.day, b.latitude, b.longitude, b.tz_offset_hours)
+    jd_ut = compute_julian_day_local(b, adjusted_tz_offset)
+
+    ay = swe.get_ayanamsa(jd_ut)
+    asc_trop = compute_lagna(jd_ut, b.latitude, b.longitude)
+    asc_sid = norm_deg(asc_trop - ay)
+    return adjusted_tz_offset, jd_ut, asc_sid
+
+
+def kundali_shad_bala(b: BirthInput) -> Dict:
+    """
+    Lightweight variant of kundali() for callers that only need Shad Bala.
+
+    Skips upagrahas, divisional charts, Bhava Bala and Dasha, and returns just
+    the "lagna", "planets" and "shad_bala" sections (same shapes as kundali()).
+    """
+    return _bala_chart(b, include_bhava_bala=False)
+
+
+def kundali_bala(b: BirthInput) -> Dict:
+    """
+    Like kundali_shad_bala(), plus a "bhava_bala" section.
+
+    Upagrahas are placed in the rasi chart so Bhava Bala (including
+    "planets_in_house") matches kundali(); Navamsa and Dasha are skipped.
+    """
+    return _bala_chart(b, include_bhava_bala=True)
+
+
+def _bala_chart(b: BirthInput, include_bhava_bala: bool) -> Dict:
+    with _EPHE_LOCK:
+        adjusted_tz_offset, jd_ut, asc_sid = _prepare_chart(b)
+        lagna_sign = deg_to_sign_index(asc_sid)
+
+        planets_out = _compute_planets(jd_ut, lagna_sign, b.ayanamsha)
+        birth_hour_local, _ = _local_birth_time(b, adjusted_tz_offset)
+
+        shad_bala = calculate_shad_bala(
+            planets_out=planets_out,
+            lagna_sign=lagna_sign,
+            lagna_longitude=asc_sid,
+            jd_ut=jd_ut,
+            birth_hour=birth_hour_local,
+            latitude=b.latitude,
+            longitude=b.longitude,
+        )
+
+        if include_bhava_bala:
+            upagrahas = calculate_upagrahas(planets_out["Sun"]["longitude"], jd_ut, b.latitude, b.longitude)
+            rasi_signs: List[List[str]] = [[] for _ in range(12)]
+            rasi_signs[lagna_sign].append("Asc")
+            for pname, info in chain(planets_out.items(), upagrahas.items()):
+                rasi_signs[info["sign_index"]].append(pname)
+            bhava_bala = calculate_bhava_bala(
+                planets_out=planets_out,
+                lagna_sign=lagna_sign,
+                lagna_longitude=asc_sid,
+                rasi_chart=dict(enumerate(rasi_signs)),
+                shad_bala=shad_bala,
+            )
+
+    out = {
+        "lagna": {
+            "longitude": round(asc_sid, 4),
+            "sign": SIGNS[lagna_sign],
+            "sign_index": lagna_sign,
+        },
+        "planets": planets_out,
+        "shad_bala": shad_bala,
+    }
+    if include_bhava_bala:
+        out["bhava_bala"] = bhava_bala
+    return out
+
+
+def kundali(b: BirthInput) -> Dict:
+    """
+    Full chart for `b`.
+
+    Results are memoized on the BirthInput fields. The cache holds a pickled
+    snapshot, so every call returns a fresh structure the caller may mutate.
+    """
+    return pickle.loads(_kundali_pickled(
+        b.year, b.month, b.day, b.hour, b.minute, b.second, b.tz_offset_hours,
+        b.latitude, b.longitude, b.ephe_path, b.ayanamsha, getattr(b, "use_utc", False),
+    ))
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _kundali_pickled(
+    year: int, month: int, day: int, hour: int, minute: int, second: int, tz_offset_hours: float,
+    latitude: float, longitude: float, ephe_path: str, ayanamsha: int, use_utc: bool,
+) -> bytes:
+    """Pickled _build_kundali() result for one set of BirthInput fields."""
+    b = BirthInput(
+        year=year, month=month, day=day, hour=hour, minute=minute, second=second,
+        tz_offset_hours=tz_offset_hours, latitude=latitude, longitude=longitude,
+        ephe_path=ephe_path, ayanamsha=ayanamsha, use_utc=use_utc,
+    )
+    with _EPHE_LOCK:
+        k = _build_kundali(b)
+    return pickle.dumps(k, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _build_kundali(b: BirthInput) -> Dict:
+    # Kala Bala and Dasha must use LOCAL civil time at birthplace, not IST.
+    adjusted_tz_offset, jd_ut, asc_sid = _prepare_chart(b)
+    original_tz_offset = b.tz_offset_hours
+    dst_applied = adjusted_tz_offset != original_tz_offset
+    dst_adjustment = adjusted_tz_offset - original_tz_offset
+
+    # For UI/debug only: also compute IST equivalent of the entered local time.
+    ist_time = convert_to_ist(
+        b.year, b.month, b.day, b.hour, b.minute, b.second,
+        b.tz_offset_hours, b.latitude, b.longitude
+    )
+
+    lagna_sign, ld, lm, ls = sign_parts(asc_sid)
+    lagna_sign_name = SIGNS[lagna_sign]
+
+    planets_out = _compute_planets(jd_ut, lagna_sign, b.ayanamsha)
+    sun_lon = planets_out["Sun"]["longitude"]
+
+    # Calculate Upagrahas
+    upagrahas = calculate_upagrahas(sun_lon, jd_ut, b.latitude, b.longitude)
+    
+    # Add house info to upagrahas
+    for uname, uinfo in upagrahas.items():
+        uinfo["house_whole_sign"] = whole_sign_house(lagna_sign, uinfo["sign_index"])
+
+    # Build rasi and Navamsa (D9) charts in one pass: Asc first in its sign,
+    # then planets, then upagrahas
+    nav_asc_sign = _navamsa_index(lagna_sign, asc_sid - 30 * lagna_sign)
+    rasi_signs: List[List[str]] = [[] for _ in range(12)]
+    navamsa_signs: List[List[str]] = [[] for _ in range(12)]
+    rasi_signs[lagna_sign].append("Asc")
+    navamsa_signs[nav_asc_sign].append("Asc")
+    for pname, info in chain(planets_out.items(), upagrahas.items()):
+        rasi_signs[info["sign_index"]].append(pname)
+        navamsa_signs[info["navamsa_sign_index"]].append(pname)
+    rasi_chart: Dict[int, List[str]] = dict(enumerate(rasi_signs))
+    navamsa_chart: Dict[int, List[str]] = dict(enumerate(navamsa_signs))
+
+    # Kala Bala depends on LOCAL civil time at birthplace.
+    birth_hour_local, birth_datetime_local = _local_birth_time(b, adjusted_tz_offset)
+
     # Calculate Shad Bala with all required parameters using LOCAL time
     shad_bala = calculate_shad_bala(
         planets_out=planets_out,
@@ -2120,21 +2353,13 @@ def kundali(b: BirthInput) -> Dict:
     )
 
     # Calculate Dasha periods using LOCAL civil time
-    moon_longitude = float(planets_out["Moon"]["longitude"])
-    dasha_data = calculate_vimshottari_dasha(moon_longitude, birth_datetime_local)
-    
-    # Calculate Antardashas for all dasha periods
-    for i, period in enumerate(dasha_data["periods"]):
-        if period.get("start_datetime"):
-            try:
-                start_date = datetime.fromisoformat(period["start_datetime"])
-            except Exception:
-                start_date = datetime(period["start_year"], period["start_month"], period["start_day"])
-        else:
-            start_date = datetime(period["start_year"], period["start_month"], period["start_day"])
-
-        antardashas = calculate_antardashas(period["planet"], start_date, float(period["years"]))
-        period["antardashas"] = antardashas
+    moon_longitude = planets_out["Moon"]["longitude"]
+    dasha_data, period_starts = _vimshottari_dasha(moon_longitude, birth_datetime_local)
+    
+    # Calculate Antardashas for all dasha periods, starting from the period's
+    # datetime directly rather than re-parsing its "start_datetime" string
+    for period, start_date in zip(dasha_data["periods"], period_starts):
+        period["antardashas"] = calculate_antardashas(period["planet"], start_date, float(period["years"]))
 
     return {
         "meta": {
@@ -2200,8 +2425,9 @@ def print_text_chart(k: Dict) -> None:
         print(f"  {pname:8s} {p['sign']:11s} {p['deg']:2d}°{p['min']:02d}'  House:{p['house_whole_sign']:2d}  {r}")
 
     print("\nRāśi chart (sign -> planets):")
+    rasi_chart = k["rasi_chart"]
     for i, s in enumerate(SIGNS):
-        pls = ", ".join(k["rasi_chart"].get(i, [])) if k["rasi_chart"].get(i) else "-"
+        pls = ", ".join(rasi_chart.get(i, ())) or "-"
         print(f"  {s:11s}: {pls}")
 
 
@@ -2219,5 +2445,6 @@ if __name__ == "__main__":
     print_text_chart(k)
 
     with open("kundali_output.json", "w", encoding="utf-8") as f:
-        json.dump(k, f, indent=2)
+        # One write of the encoded document; json.dump() issues a write per token
+        f.write(json.dumps(k, indent=2))
     print("\nSaved: kundali_output.json")
@@ -1,19 +1,25 @@
 from fastapi import FastAPI, HTTPException, Header
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import swisseph as swe
 import os
+import hashlib
 import json
+import queue
 import sqlite3
 import threading
 import uuid
 import urllib.parse
 import urllib.request
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
-from kundali_maker import BirthInput, kundali, local_to_utc, utc_to_local
+from kundali_maker import BirthInput, kundali, kundali_bala, local_to_utc, utc_to_local
 
 app = FastAPI(
     title="Kundali API",
@@ -39,56 +45,129 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 EPHE_PATH = os.environ.get("EPHE_PATH", "./ephe")
 DB_PATH = os.environ.get("DB_PATH", "./kundali.db")
+DB_READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "8"))
+
+# Per-connection settings. WAL journal mode itself is persistent and is set
+# once in _db_init().
+_DB_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+# Writes go through a single persistent connection guarded by _DB_LOCK; reads
+# check out pooled connections and run concurrently under WAL.
 _DB_LOCK = threading.Lock()
+_db_write_conn: Optional[sqlite3.Connection] = None
+_db_read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=DB_READ_POOL_SIZE)
 
 
 def _db_connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    # Connections are long-lived, so a larger statement cache keeps every
+    # chart query compiled for the life of the process
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    for pragma in _DB_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
-def _db_init() -> None:
-    with _DB_LOCK:
+@contextmanager
+def _db_reader() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled read connection (opened on demand, kept up to DB_READ_POOL_SIZE)."""
+    try:
+        conn = _db_read_pool.get_nowait()
+    except queue.Empty:
         conn = _db_connect()
+    try:
+        yield conn
+    finally:
         try:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS charts (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    birth_data_json TEXT NOT NULL,
-                    kundali_data_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    location_name TEXT,
-                    latitude REAL,
-                    longitude REAL,
-                    timezone REAL
-                );
-                """
-            )
-            # Unique chart name per user (case-insensitive)
-            conn.execute(
-                """
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_charts_user_name
-                ON charts(user_id, name COLLATE NOCASE);
-                """
-            )
-            conn.commit()
-        finally:
+            _db_read_pool.put_nowait(conn)
+        except queue.Full:
             conn.close()
 
 
+@contextmanager
+def _db_writer() -> Iterator[sqlite3.Connection]:
+    """Hold the writer lock and the shared write connection; uncommitted work is rolled back."""
+    global _db_write_conn
+    with _DB_LOCK:
+        if _db_write_conn is None:
+            _db_write_conn = _db_connect()
+        conn = _db_write_conn
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+
+def _db_close_all() -> None:
+    global _db_write_conn
+    with _DB_LOCK:
+        if _db_write_conn is not None:
+            _db_write_conn.close()
+            _db_write_conn = None
+    while True:
+        try:
+            _db_read_pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+
+def _db_init() -> None:
+    with _db_writer() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS charts (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                birth_data_json TEXT NOT NULL,
+                kundali_data_json TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                location_name TEXT,
+                latitude REAL,
+                longitude REAL,
+                timezone REAL
+            );
+            """
+        )
+        # Unique chart name per user (case-insensitive)
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_charts_user_name
+            ON charts(user_id, name COLLATE NOCASE);
+            """
+        )
+        # list_charts reads a user's charts newest first
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_charts_user_created
+            ON charts(user_id, created_at DESC);
+            """
+        )
+        conn.commit()
+
+
 @app.on_event("startup")
 def _startup() -> None:
     _db_init()
 
 
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    _db_close_all()
+
+
 class KundaliRequest(BaseModel):
     year: int = Field(..., ge=1, le=3000, description="Birth year")
     month: int = Field(..., ge=1, le=12, description="Birth month")
@@ -169,6 +248,11 @@ class ChartResponse(BaseModel):
     coordinates: Optional[Dict[str, Any]] = None
 
 
+def _utc_now_iso() -> str:
+    """Current UTC time as stored in created_at, e.g. 2024-01-31T12:00:00.123456Z."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
 def _require_user_id(x_user_id: Optional[str]) -> str:
     uid = (x_user_id or "").strip()
     if not uid:
@@ -176,6 +260,34 @@ def _require_user_id(x_user_id: Optional[str]) -> str:
     return uid
 
 
+# Columns read by _row_to_chart / _chart_json (everything but user_id)
+_CHART_COLUMNS = (
+    "id, name, birth_data_json, kundali_data_json, created_at, "
+    "location_name, latitude, longitude, timezone"
+)
+
+# Chart statements, built once so each connection's statement cache sees the
+# same SQL text on every request
+_SQL_LIST_CHARTS = f"SELECT {_CHART_COLUMNS} FROM charts WHERE user_id = ? ORDER BY created_at DESC"
+_SQL_INSERT_COLUMNS = """
+    INTO charts (
+        id, user_id, name, birth_data_json, kundali_data_json, created_at,
+        location_name, latitude, longitude, timezone
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_CHART = f"INSERT {_SQL_INSERT_COLUMNS} RETURNING {_CHART_COLUMNS}"
+# The unique (user_id, name) index makes OR IGNORE skip duplicate names
+_SQL_IMPORT_CHART = f"INSERT OR IGNORE {_SQL_INSERT_COLUMNS}"
+_SQL_UPDATE_CHART = f"""
+    UPDATE charts
+    SET name = ?, birth_data_json = ?, kundali_data_json = ?, location_name = ?,
+        latitude = ?, longitude = ?, timezone = ?
+    WHERE id = ? AND user_id = ?
+    RETURNING {_CHART_COLUMNS}
+"""
+_SQL_DELETE_CHART = "DELETE FROM charts WHERE id = ? AND user_id = ?"
+
+
 def _row_to_chart(row: sqlite3.Row) -> Dict[str, Any]:
     birth = {}
     kundali_data = {}
@@ -203,6 +315,57 @@ def _row_to_chart(row: sqlite3.Row) -> Dict[str, Any]:
     }
 
 
+# Same settings FastAPI's JSONResponse renders with
+_encode_json = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+def _is_plain_json_object(raw: str) -> bool:
+    """Cheap check that a stored JSON column can be embedded verbatim in a response."""
+    return raw[:1] == "{" and raw[-1:] == "}" and "NaN" not in raw and "Infinity" not in raw
+
+
+def _chart_json(row: Any) -> str:
+    """
+    ChartResponse JSON for a charts row.
+
+    The stored birth/kundali JSON is spliced in as-is instead of being decoded
+    and re-encoded. Rows whose columns can't be embedded directly (empty,
+    non-finite numbers) are encoded the way FastAPI renders a ChartResponse.
+    """
+    birth_raw = row["birth_data_json"]
+    kundali_raw = row["kundali_data_json"]
+    if birth_raw and kundali_raw and _is_plain_json_object(birth_raw) and _is_plain_json_object(kundali_raw):
+        coords = None
+        if row["latitude"] is not None and row["longitude"] is not None and row["timezone"] is not None:
+            coords = {"latitude": row["latitude"], "longitude": row["longitude"], "timezone": row["timezone"]}
+        try:
+            return (
+                f'{{"id":{_encode_json(row["id"])},"name":{_encode_json(row["name"])},'
+                f'"birthData":{birth_raw},"kundaliData":{kundali_raw},'
+                f'"createdAt":{_encode_json(row["created_at"])},'
+                f'"locationName":{_encode_json(row["location_name"])},'
+                f'"coordinates":{_encode_json(coords)}}}'
+            )
+        except ValueError:
+            pass
+    return _encode_json(jsonable_encoder(ChartResponse(**_row_to_chart(row))))
+
+
+def _json_response(content: str) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, so W/ prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
 class ReverseGeocodeResponse(BaseModel):
     city: Optional[str] = None
     state: Optional[str] = None
@@ -241,6 +404,12 @@ AYANAMSHA_MAP = {
 }
 
 
+@lru_cache(maxsize=32)
+def _resolve_ayanamsha(name: Optional[str]) -> int:
+    """Swiss Ephemeris sidereal mode for a request's ayanamsha name (default Lahiri)."""
+    return AYANAMSHA_MAP.get((name or "lahiri").lower(), swe.SIDM_LAHIRI)
+
+
 RASHI_LORD = {
     "Aries": "Mars",
     "Taurus": "Venus",
@@ -258,15 +427,26 @@ RASHI_LORD = {
 
 
 PLANET_FRIENDS = {
-    "Sun": {"friends": {"Moon", "Mars", "Jupiter"}, "neutrals": {"Mercury"}, "enemies": {"Venus", "Saturn"}},
-    "Moon": {"friends": {"Sun", "Mercury"}, "neutrals": {"Mars", "Jupiter", "Venus", "Saturn"}, "enemies": set()},
-    "Mars": {"friends": {"Sun", "Moon", "Jupiter"}, "neutrals": {"Venus", "Saturn"}, "enemies": {"Mercury"}},
-    "Mercury": {"friends": {"Sun", "Venus"}, "neutrals": {"Mars", "Jupiter", "Saturn"}, "enemies": {"Moon"}},
-    "Jupiter": {"friends": {"Sun", "Moon", "Mars"}, "neutrals": {"Saturn"}, "enemies": {"Mercury", "Venus"}},
-    "Venus": {"friends": {"Mercury", "Saturn"}, "neutrals": {"Mars", "Jupiter"}, "enemies": {"Sun", "Moon"}},
-    "Saturn": {"friends": {"Mercury", "Venus"}, "neutrals": {"Jupiter"}, "enemies": {"Sun", "Moon", "Mars"}},
+    "Sun": {"friends": frozenset({"Moon", "Mars", "Jupiter"}), "neutrals": frozenset({"Mercury"}), "enemies": frozenset({"Venus", "Saturn"})},
+    "Moon": {"friends": frozenset({"Sun", "Mercury"}), "neutrals": frozenset({"Mars", "Jupiter", "Venus", "Saturn"}), "enemies": frozenset()},
+    "Mars": {"friends": frozenset({"Sun", "Moon", "Jupiter"}), "neutrals": frozenset({"Venus", "Saturn"}), "enemies": frozenset({"Mercury"})},
+    "Mercury": {"friends": frozenset({"Sun", "Venus"}), "neutrals": frozenset({"Mars", "Jupiter", "Saturn"}), "enemies": frozenset({"Moon"})},
+    "Jupiter": {"friends": frozenset({"Sun", "Moon", "Mars"}), "neutrals": frozenset({"Saturn"}), "enemies": frozenset({"Mercury", "Venus"})},
+    "Venus": {"friends": frozenset({"Mercury", "Saturn"}), "neutrals": frozenset({"Mars", "Jupiter"}), "enemies": frozenset({"Sun", "Moon"})},
+    "Saturn": {"friends": frozenset({"Mercury", "Venus"}), "neutrals": frozenset({"Jupiter"}), "enemies": frozenset({"Sun", "Moon", "Mars"})},
 }
 
+# PLANET_REL[i][j] is how planet i regards planet j (1 friend, 0 neutral,
+# -1 enemy), with planets indexed in PLANET_FRIENDS order via _PLANET_INDEX
+_PLANET_INDEX = {planet: i for i, planet in enumerate(PLANET_FRIENDS)}
+PLANET_REL = tuple(
+    tuple(
+        1 if other in rel["friends"] else -1 if other in rel["enemies"] else 0
+        for other in PLANET_FRIENDS
+    )
+    for rel in PLANET_FRIENDS.values()
+)
+
 
 NAKSHATRA_NAMES = [
     "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashirsha", "Ardra", "Punarvasu",
@@ -276,38 +456,27 @@ NAKSHATRA_NAMES = [
 ]
 
 
+# Gana groups; each nakshatra belongs to exactly one
+_DEVA_NAKSHATRAS = (
+    "Ashwini", "Mrigashirsha", "Punarvasu", "Pushya", "Hasta", "Swati", "Anuradha",
+    "Shravana", "Revati",
+)
+_MANUSHYA_NAKSHATRAS = (
+    "Bharani", "Rohini", "Ardra", "Purva Phalguni", "Uttara Phalguni", "Chitra", "Vishakha",
+    "Jyeshtha", "Purva Ashadha", "Uttara Ashadha", "Dhanishta", "Shatabhisha",
+    "Purva Bhadrapada", "Uttara Bhadrapada",
+)
+_RAKSHASA_NAKSHATRAS = ("Krittika", "Ashlesha", "Magha", "Mula")
+
 NAKSHATRA_GANA = {
-    # Deva (divine temperament)
-    "Ashwini": "Deva",
-    "Mrigashirsha": "Deva",
-    "Punarvasu": "Deva",
-    "Pushya": "Deva",
-    "Hasta": "Deva",
-    "Swati": "Deva",
-    "Anuradha": "Deva",
-    "Shravana": "Deva",
-    "Revati": "Deva",
-    # Manushya (human temperament)
-    "Bharani": "Manushya",
-    "Rohini": "Manushya",
-    "Ardra": "Manushya",
-    "Purva Phalguni": "Manushya",
-    "Uttara Phalguni": "Manushya",
-    "Chitra": "Manushya",
-    "Vishakha": "Manushya",
-    "Jyeshtha": "Manushya",
-    "Purva Ashadha": "Manushya",
-    "Uttara Ashadha": "Manushya",
-    "Dhanishta": "Manushya",
-    "Shatabhisha": "Manushya",
-    "Purva Bhadrapada": "Manushya",
-    "Uttara Bhadrapada": "Manushya",
-    # Rakshasa (demon temperament)
-    "Krittika": "Rakshasa",
-    "Ashlesha": "Rakshasa",
-    "Magha": "Rakshasa",
-    "Mula": "Rakshasa",
+    **{name: "Deva" for name in _DEVA_NAKSHATRAS},
+    **{name: "Manushya" for name in _MANUSHYA_NAKSHATRAS},
+    **{name: "Rakshasa" for name in _RAKSHASA_NAKSHATRAS},
 }
+assert (
+    len(_DEVA_NAKSHATRAS) + len(_MANUSHYA_NAKSHATRAS) + len(_RAKSHASA_NAKSHATRAS) == len(NAKSHATRA_NAMES)
+    and set(NAKSHATRA_GANA) == set(NAKSHATRA_NAMES)
+), "every nakshatra needs exactly one gana"
 
 
 NAKSHATRA_NADI = {
@@ -355,15 +524,43 @@ NAKSHATRA_YONI = {
 }
 
 
-def _planet_relationship(p1: str, p2: str) -> str:
-    rel = PLANET_FRIENDS.get(p1)
-    if not rel:
-        return "neutral"
-    if p2 in rel["friends"]:
-        return "friend"
-    if p2 in rel["enemies"]:
-        return "enemy"
-    return "neutral"
+# (gana, nadi, yoni) per nakshatra name, so matching does one lookup per person
+NAKSHATRA_TRAITS = {
+    name: (NAKSHATRA_GANA[name], NAKSHATRA_NADI[name], NAKSHATRA_YONI[name])
+    for name in NAKSHATRA_NAMES
+}
+_UNKNOWN_TRAITS = ("", "", "")
+
+# Gana scores for differing ganas; any other differing pair (Deva + Rakshasa) scores 1
+_GANA_PAIR_SCORES = {
+    ("Deva", "Manushya"): 5.0,
+    ("Manushya", "Deva"): 5.0,
+    ("Manushya", "Rakshasa"): 3.0,
+    ("Rakshasa", "Manushya"): 3.0,
+}
+
+# Hostile yoni pairs, both orders
+_HOSTILE_YONI_PAIRS = frozenset(
+    pair
+    for a, b in (
+        ("Cat", "Rat"), ("Dog", "Deer"), ("Lion", "Elephant"),
+        ("Serpent", "Mongoose"), ("Monkey", "Sheep"), ("Tiger", "Cow"),
+    )
+    for pair in ((a, b), (b, a))
+)
+
+# Bhakoot dosha sign distances (2/12, 5/9, 6/8) as a bitmask over 1..12
+_BHAKOOT_DOSHA_MASK = sum(1 << d for d in (2, 12, 5, 9, 6, 8))
+
+# Vashya points, VASHYA_TABLE[group1][group2]; pairs outside the table score 1
+VASHYA_TABLE = {
+    "Chatushpada": {"Chatushpada": 2.0, "Manava": 1.0, "Jalachara": 1.0, "Vanachara": 1.5, "Keeta": 1.0},
+    "Manava": {"Chatushpada": 1.0, "Manava": 2.0, "Jalachara": 1.5, "Vanachara": 0.0, "Keeta": 1.0},
+    "Jalachara": {"Chatushpada": 1.0, "Manava": 1.5, "Jalachara": 2.0, "Vanachara": 1.0, "Keeta": 1.0},
+    "Vanachara": {"Chatushpada": 0.0, "Manava": 0.0, "Jalachara": 0.0, "Vanachara": 2.0, "Keeta": 0.0},
+    "Keeta": {"Chatushpada": 1.0, "Manava": 1.0, "Jalachara": 1.0, "Vanachara": 0.0, "Keeta": 2.0},
+}
+_NO_VASHYA_ROW: Dict[str, float] = {}
 
 
 def _tara_score(n1: int, n2: int) -> float:
@@ -379,7 +576,7 @@ def _bhakoot_score(r1: int, r2: int) -> float:
     # r1,r2 are 0-11. Consider distance between signs.
     dist = ((r2 - r1) % 12) + 1  # 1..12
     # 2/12, 5/9, 6/8 are considered dosha in common systems.
-    if dist in {2, 12, 5, 9, 6, 8}:
+    if (_BHAKOOT_DOSHA_MASK >> dist) & 1:
         return 0.0
     return 7.0
 
@@ -395,13 +592,7 @@ def _gana_score(g1: str, g2: str) -> float:
         return 3.0
     if g1 == g2:
         return 6.0
-    pair = {g1, g2}
-    if pair == {"Deva", "Manushya"}:
-        return 5.0
-    if pair == {"Manushya", "Rakshasa"}:
-        return 3.0
-    # Deva + Rakshasa
-    return 1.0
+    return _GANA_PAIR_SCORES.get((g1, g2), 1.0)
 
 
 def _yoni_score(y1: str, y2: str) -> float:
@@ -410,15 +601,7 @@ def _yoni_score(y1: str, y2: str) -> float:
     if y1 == y2:
         return 4.0
     # Simplified compatibility: some pairs are hostile.
-    hostile_pairs = {
-        ("Cat", "Rat"), ("Rat", "Cat"),
-        ("Dog", "Deer"), ("Deer", "Dog"),
-        ("Lion", "Elephant"), ("Elephant", "Lion"),
-        ("Serpent", "Mongoose"), ("Mongoose", "Serpent"),
-        ("Monkey", "Sheep"), ("Sheep", "Monkey"),
-        ("Tiger", "Cow"), ("Cow", "Tiger"),
-    }
-    if (y1, y2) in hostile_pairs:
+    if (y1, y2) in _HOSTILE_YONI_PAIRS:
         return 0.0
     return 3.0
 
@@ -446,11 +629,13 @@ def _graha_maitri_score(sign1: str, sign2: str) -> float:
     lord2 = RASHI_LORD.get(sign2)
     if not lord1 or not lord2:
         return 2.5
-    r12 = _planet_relationship(lord1, lord2)
-    r21 = _planet_relationship(lord2, lord1)
-    if r12 == "friend" and r21 == "friend":
+    i1 = _PLANET_INDEX[lord1]
+    i2 = _PLANET_INDEX[lord2]
+    r12 = PLANET_REL[i1][i2]
+    r21 = PLANET_REL[i2][i1]
+    if r12 == 1 and r21 == 1:
         return 5.0
-    if r12 == "enemy" and r21 == "enemy":
+    if r12 == -1 and r21 == -1:
         return 0.0
     return 3.0
 
@@ -476,14 +661,21 @@ def _vashya_score(g1: str, g2: str) -> float:
     # Since we don't know bride/groom, we apply direction-aware scoring in the caller.
     if not g1 or not g2:
         return 1.0
-    table = {
-        "Chatushpada": {"Chatushpada": 2.0, "Manava": 1.0, "Jalachara": 1.0, "Vanachara": 1.5, "Keeta": 1.0},
-        "Manava": {"Chatushpada": 1.0, "Manava": 2.0, "Jalachara": 1.5, "Vanachara": 0.0, "Keeta": 1.0},
-        "Jalachara": {"Chatushpada": 1.0, "Manava": 1.5, "Jalachara": 2.0, "Vanachara": 1.0, "Keeta": 1.0},
-        "Vanachara": {"Chatushpada": 0.0, "Manava": 0.0, "Jalachara": 0.0, "Vanachara": 2.0, "Keeta": 0.0},
-        "Keeta": {"Chatushpada": 1.0, "Manava": 1.0, "Jalachara": 1.0, "Vanachara": 0.0, "Keeta": 2.0},
-    }
-    return float(table.get(g1, {}).get(g2, 1.0))
+    return VASHYA_TABLE.get(g1, _NO_VASHYA_ROW).get(g2, 1.0)
+
+
+# Sign-derived matching inputs indexed by sign index (0 = Aries), so scoring
+# works from the Moon's sign_index instead of re-deriving them from the name.
+# Out-of-range indices use the values an unknown sign name gets.
+VARNA_BY_SIGN = tuple(_varna_from_rashi(sign) for sign in RASHI_LORD)
+VASHYA_BY_SIGN = tuple(_vashya_group(sign) for sign in RASHI_LORD)
+# MAITRI_BY_SIGN[r1][r2] = _graha_maitri_score for the two signs
+MAITRI_BY_SIGN = tuple(
+    tuple(_graha_maitri_score(sign1, sign2) for sign2 in RASHI_LORD) for sign1 in RASHI_LORD
+)
+_UNKNOWN_SIGN_VARNA = _varna_from_rashi("")
+_UNKNOWN_SIGN_VASHYA = _vashya_group("")
+_UNKNOWN_SIGN_MAITRI = _graha_maitri_score("", "")
 
 
 def _extract_moon_info(chart: dict) -> dict:
@@ -504,6 +696,8 @@ def _extract_moon_info(chart: dict) -> dict:
 
 
 def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
+    # Every field is computed here with the declared type, so the items are
+    # built with model_construct() rather than re-validated
     m1 = _extract_moon_info(chart1)
     m2 = _extract_moon_info(chart2)
 
@@ -516,15 +710,20 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
 
     nak1 = str(m1.get("nakshatra_name") or "")
     nak2 = str(m2.get("nakshatra_name") or "")
+    g1, nd1, y1 = NAKSHATRA_TRAITS.get(nak1, _UNKNOWN_TRAITS)
+    g2, nd2, y2 = NAKSHATRA_TRAITS.get(nak2, _UNKNOWN_TRAITS)
+
+    known1 = 0 <= r1 <= 11
+    known2 = 0 <= r2 <= 11
 
     scores: List[MatchScoreItem] = []
 
     # Varna (1)
-    v1 = _varna_from_rashi(s1)
-    v2 = _varna_from_rashi(s2)
+    v1 = VARNA_BY_SIGN[r1] if known1 else _UNKNOWN_SIGN_VARNA
+    v2 = VARNA_BY_SIGN[r2] if known2 else _UNKNOWN_SIGN_VARNA
     # Varna is traditionally directional (bride vs groom). We average both directions.
     varna = (_varna_score(v1, v2) + _varna_score(v2, v1)) / 2.0
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Varna",
         score=varna,
         maxScore=1.0,
@@ -532,11 +731,11 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     # Vashya (2)
-    vg1 = _vashya_group(s1)
-    vg2 = _vashya_group(s2)
+    vg1 = VASHYA_BY_SIGN[r1] if known1 else _UNKNOWN_SIGN_VASHYA
+    vg2 = VASHYA_BY_SIGN[r2] if known2 else _UNKNOWN_SIGN_VASHYA
     # Vashya is also commonly treated directionally; average both directions.
     vashya = (_vashya_score(vg1, vg2) + _vashya_score(vg2, vg1)) / 2.0
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Vashya",
         score=vashya,
         maxScore=2.0,
@@ -549,7 +748,7 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
         # Tara is direction-based (counting from one nakshatra to the other).
         # Instead of the strict min() (which is very harsh), average both directions.
         tara = (_tara_score(n1, n2) + _tara_score(n2, n1)) / 2.0
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Tara",
         score=tara,
         maxScore=3.0,
@@ -557,10 +756,8 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     # Yoni (4)
-    y1 = NAKSHATRA_YONI.get(nak1, "")
-    y2 = NAKSHATRA_YONI.get(nak2, "")
     yoni = _yoni_score(y1, y2)
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Yoni",
         score=yoni,
         maxScore=4.0,
@@ -568,8 +765,8 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     # Graha Maitri (5)
-    maitri = _graha_maitri_score(s1, s2)
-    scores.append(MatchScoreItem(
+    maitri = MAITRI_BY_SIGN[r1][r2] if known1 and known2 else _UNKNOWN_SIGN_MAITRI
+    scores.append(MatchScoreItem.model_construct(
         category="Graha Maitri",
         score=maitri,
         maxScore=5.0,
@@ -577,10 +774,8 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     # Gana (6)
-    g1 = NAKSHATRA_GANA.get(nak1, "")
-    g2 = NAKSHATRA_GANA.get(nak2, "")
     gana = _gana_score(g1, g2)
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Gana",
         score=gana,
         maxScore=6.0,
@@ -589,9 +784,9 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
 
     # Bhakoot (7)
     bhakoot = 0.0
-    if 0 <= r1 <= 11 and 0 <= r2 <= 11:
+    if known1 and known2:
         bhakoot = _bhakoot_score(r1, r2)
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Bhakoot",
         score=bhakoot,
         maxScore=7.0,
@@ -599,10 +794,8 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     # Nadi (8)
-    nd1 = NAKSHATRA_NADI.get(nak1, "")
-    nd2 = NAKSHATRA_NADI.get(nak2, "")
     nadi = _nadi_score(nd1, nd2)
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Nadi",
         score=nadi,
         maxScore=8.0,
@@ -610,7 +803,7 @@ def _ashtakoota_scores(chart1: dict, chart2: dict) -> List[MatchScoreItem]:
     ))
 
     total = sum(s.score for s in scores)
-    scores.append(MatchScoreItem(
+    scores.append(MatchScoreItem.model_construct(
         category="Overall Compatibility",
         score=total,
         maxScore=36.0,
@@ -627,32 +820,30 @@ async def root():
 
 
 @app.get("/health")
-async def health():
+def health():
     try:
         # Test database connection
-        with _DB_LOCK:
-            conn = _db_connect()
+        with _db_reader() as conn:
             conn.execute("SELECT 1")
-            conn.close()
         
         return {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_now_iso(),
             "version": "1.0.0",
             "database": "connected"
         }
     except Exception as e:
         return {
             "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_now_iso(),
             "error": str(e)
         }
 
 
 @app.post("/api/kundali")
-async def generate_kundali(request: KundaliRequest):
+def generate_kundali(request: KundaliRequest):
     try:
-        ayanamsha_code = AYANAMSHA_MAP.get(request.ayanamsha.lower(), swe.SIDM_LAHIRI)
+        ayanamsha_code = _resolve_ayanamsha(request.ayanamsha)
         
         birth_input = BirthInput(
             year=request.year,
@@ -666,34 +857,43 @@ async def generate_kundali(request: KundaliRequest):
             longitude=request.longitude,
             ephe_path=EPHE_PATH,
             ayanamsha=ayanamsha_code,
-            use_utc=request.use_utc or False
+            use_utc=bool(request.use_utc)
         )
         
-        result = kundali(birth_input)
-        return result
+        # kundali() is memoized per birth input and returns plain JSON types,
+        # so render it directly instead of running jsonable_encoder over it
+        return JSONResponse(content=kundali(birth_input))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/charts", response_model=List[ChartResponse])
-async def list_charts(x_user_id: Optional[str] = Header(default=None, alias="X-User-Id")):
+def list_charts(
+    x_user_id: Optional[str] = Header(default=None, alias="X-User-Id"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+):
     user_id = _require_user_id(x_user_id)
-    with _DB_LOCK:
-        conn = _db_connect()
-        try:
-            cur = conn.execute(
-                "SELECT * FROM charts WHERE user_id = ? ORDER BY created_at DESC",
-                (user_id,),
-            )
-            rows = cur.fetchall()
-            return [_row_to_chart(r) for r in rows]
-        finally:
-            conn.close()
+    with _db_reader() as conn:
+        rows = conn.execute(_SQL_LIST_CHARTS, (user_id,)).fetchall()
+    body = ("[" + ",".join(_chart_json(r) for r in rows) + "]").encode("utf-8")
+
+    # The ETag is a digest of the body itself: updates keep created_at, so
+    # count/newest-timestamp tags would miss edits. Unchanged lists still
+    # cost no bytes on the wire.
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=0, must-revalidate",
+        "Vary": "X-User-Id",
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.post("/api/charts", response_model=ChartResponse)
-async def create_chart(
+def create_chart(
     payload: ChartCreateRequest,
     x_user_id: Optional[str] = Header(default=None, alias="X-User-Id"),
 ):
@@ -703,7 +903,7 @@ async def create_chart(
         raise HTTPException(status_code=400, detail="Chart name is required")
 
     # Compute kundali to store
-    ay = AYANAMSHA_MAP.get((payload.birthData.ayanamsha or "lahiri").lower(), swe.SIDM_LAHIRI)
+    ay = _resolve_ayanamsha(payload.birthData.ayanamsha)
     b = BirthInput(
         year=payload.birthData.year,
         month=payload.birthData.month,
@@ -716,65 +916,46 @@ async def create_chart(
         longitude=payload.birthData.longitude,
         ephe_path=EPHE_PATH,
         ayanamsha=ay,
-        use_utc=payload.birthData.use_utc or False,
+        use_utc=bool(payload.birthData.use_utc),
     )
     kundali_data = kundali(b)
 
     chart_id = str(uuid.uuid4())
-    created_at = datetime.utcnow().isoformat() + "Z"
+    created_at = _utc_now_iso()
     birth_json = payload.birthData.model_dump()
     loc_name = payload.locationName
     lat = float(payload.birthData.latitude)
     lon = float(payload.birthData.longitude)
     tz = float(payload.birthData.tz_offset_hours)
+    # Encode once, outside the writer lock; the same strings are stored and echoed back
+    birth_data_json = json.dumps(birth_json)
+    kundali_data_json = json.dumps(kundali_data)
 
-    with _DB_LOCK:
-        conn = _db_connect()
+    with _db_writer() as conn:
         try:
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO charts (
-                        id, user_id, name, birth_data_json, kundali_data_json, created_at,
-                        location_name, latitude, longitude, timezone
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        chart_id,
-                        user_id,
-                        name,
-                        json.dumps(birth_json),
-                        json.dumps(kundali_data),
-                        created_at,
-                        loc_name,
-                        lat,
-                        lon,
-                        tz,
-                    ),
-                )
-                conn.commit()
-            except sqlite3.IntegrityError:
-                raise HTTPException(status_code=409, detail=f'A chart named "{name}" already exists')
-
-            row = {
-                "id": chart_id,
-                "user_id": user_id,
-                "name": name,
-                "birth_data_json": json.dumps(birth_json),
-                "kundali_data_json": json.dumps(kundali_data),
-                "created_at": created_at,
-                "location_name": loc_name,
-                "latitude": lat,
-                "longitude": lon,
-                "timezone": tz,
-            }
-            return _row_to_chart(row)  # type: ignore[arg-type]
-        finally:
-            conn.close()
+            row = conn.execute(
+                _SQL_INSERT_CHART,
+                (
+                    chart_id,
+                    user_id,
+                    name,
+                    birth_data_json,
+                    kundali_data_json,
+                    created_at,
+                    loc_name,
+                    lat,
+                    lon,
+                    tz,
+                ),
+            ).fetchone()
+            conn.commit()
+        except sqlite3.IntegrityError:
+            raise HTTPException(status_code=409, detail=f'A chart named "{name}" already exists')
+    return _json_response(_chart_json(row))
 
 
 @app.put("/api/charts/{chart_id}", response_model=ChartResponse)
-async def update_chart(
+def update_chart(
     chart_id: str,
     payload: ChartUpdateRequest,
     x_user_id: Optional[str] = Header(default=None, alias="X-User-Id"),
@@ -784,7 +965,7 @@ async def update_chart(
     if not name:
         raise HTTPException(status_code=400, detail="Chart name is required")
 
-    ay = AYANAMSHA_MAP.get((payload.birthData.ayanamsha or "lahiri").lower(), swe.SIDM_LAHIRI)
+    ay = _resolve_ayanamsha(payload.birthData.ayanamsha)
     b = BirthInput(
         year=payload.birthData.year,
         month=payload.birthData.month,
@@ -797,7 +978,7 @@ async def update_chart(
         longitude=payload.birthData.longitude,
         ephe_path=EPHE_PATH,
         ayanamsha=ay,
-        use_utc=payload.birthData.use_utc or False,
+        use_utc=bool(payload.birthData.use_utc),
     )
     kundali_data = kundali(b)
 
@@ -806,133 +987,113 @@ async def update_chart(
     lat = float(payload.birthData.latitude)
     lon = float(payload.birthData.longitude)
     tz = float(payload.birthData.tz_offset_hours)
+    birth_data_json = json.dumps(birth_json)
+    kundali_data_json = json.dumps(kundali_data)
 
-    with _DB_LOCK:
-        conn = _db_connect()
+    with _db_writer() as conn:
         try:
-            try:
-                cur = conn.execute(
-                    """
-                    UPDATE charts
-                    SET name = ?, birth_data_json = ?, kundali_data_json = ?, location_name = ?,
-                        latitude = ?, longitude = ?, timezone = ?
-                    WHERE id = ? AND user_id = ?
-                    """,
-                    (
-                        name,
-                        json.dumps(birth_json),
-                        json.dumps(kundali_data),
-                        loc_name,
-                        lat,
-                        lon,
-                        tz,
-                        chart_id,
-                        user_id,
-                    ),
-                )
-                conn.commit()
-            except sqlite3.IntegrityError:
-                raise HTTPException(status_code=409, detail=f'A chart named "{name}" already exists')
-
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Chart not found")
-
-            row = conn.execute("SELECT * FROM charts WHERE id = ? AND user_id = ?", (chart_id, user_id)).fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Chart not found")
-            return _row_to_chart(row)
-        finally:
-            conn.close()
+            # RETURNING hands back the updated row, so there's no follow-up
+            # SELECT that a concurrent delete could race
+            row = conn.execute(
+                _SQL_UPDATE_CHART,
+                (
+                    name,
+                    birth_data_json,
+                    kundali_data_json,
+                    loc_name,
+                    lat,
+                    lon,
+                    tz,
+                    chart_id,
+                    user_id,
+                ),
+            ).fetchone()
+            conn.commit()
+        except sqlite3.IntegrityError:
+            raise HTTPException(status_code=409, detail=f'A chart named "{name}" already exists')
+    if row is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    return _json_response(_chart_json(row))
 
 
 @app.delete("/api/charts/{chart_id}")
-async def delete_chart(
+def delete_chart(
     chart_id: str,
     x_user_id: Optional[str] = Header(default=None, alias="X-User-Id"),
 ):
     user_id = _require_user_id(x_user_id)
-    with _DB_LOCK:
-        conn = _db_connect()
-        try:
-            cur = conn.execute("DELETE FROM charts WHERE id = ? AND user_id = ?", (chart_id, user_id))
-            conn.commit()
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Chart not found")
-            return {"ok": True}
-        finally:
-            conn.close()
+    with _db_writer() as conn:
+        cur = conn.execute(_SQL_DELETE_CHART, (chart_id, user_id))
+        conn.commit()
+        if cur.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Chart not found")
+        return {"ok": True}
 
 
 @app.post("/api/charts/import")
-async def import_charts(
+def import_charts(
     payload: ChartImportRequest,
     x_user_id: Optional[str] = Header(default=None, alias="X-User-Id"),
 ):
     """Import charts from client (one-time localStorage migration). Skips duplicates by name."""
     user_id = _require_user_id(x_user_id)
-    imported = 0
-    skipped = 0
+    # Charts without a createdAt are stamped with the time of the import
+    default_created_at = _utc_now_iso()
 
-    with _DB_LOCK:
-        conn = _db_connect()
+    rows = []
+    for c in payload.charts:
         try:
-            for c in payload.charts:
+            name = str(c.get("name", "")).strip()
+            birth_data = c.get("birthData")
+            kundali_data = c.get("kundaliData")
+            created_at = str(c.get("createdAt") or default_created_at)
+            location_name = c.get("locationName")
+            coords = c.get("coordinates") or {}
+
+            if not name or not isinstance(birth_data, dict) or not isinstance(kundali_data, dict):
+                continue
+
+            rows.append((
+                str(uuid.uuid4()),
+                user_id,
+                name,
+                json.dumps(birth_data),
+                json.dumps(kundali_data),
+                created_at,
+                location_name,
+                coords.get("latitude"),
+                coords.get("longitude"),
+                coords.get("timezone"),
+            ))
+        except Exception:
+            continue
+
+    # One transaction for the whole batch
+    with _db_writer() as conn:
+        try:
+            imported = conn.executemany(_SQL_IMPORT_CHART, rows).rowcount
+        except Exception:
+            # A row SQLite cannot bind (e.g. a nested object as a coordinate)
+            # fails the whole batch; retry row by row, skipping the bad ones.
+            conn.rollback()
+            imported = 0
+            for row in rows:
                 try:
-                    name = str(c.get("name", "")).strip()
-                    birth_data = c.get("birthData")
-                    kundali_data = c.get("kundaliData")
-                    created_at = str(c.get("createdAt") or datetime.utcnow().isoformat() + "Z")
-                    location_name = c.get("locationName")
-                    coords = c.get("coordinates") or {}
-
-                    if not name or not isinstance(birth_data, dict) or not isinstance(kundali_data, dict):
-                        skipped += 1
-                        continue
-
-                    chart_id = str(uuid.uuid4())
-                    lat = coords.get("latitude")
-                    lon = coords.get("longitude")
-                    tz = coords.get("timezone")
-
-                    try:
-                        conn.execute(
-                            """
-                            INSERT INTO charts (
-                                id, user_id, name, birth_data_json, kundali_data_json, created_at,
-                                location_name, latitude, longitude, timezone
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                chart_id,
-                                user_id,
-                                name,
-                                json.dumps(birth_data),
-                                json.dumps(kundali_data),
-                                created_at,
-                                location_name,
-                                lat,
-                                lon,
-                                tz,
-                            ),
-                        )
-                        imported += 1
-                    except sqlite3.IntegrityError:
-                        skipped += 1
+                    imported += conn.execute(_SQL_IMPORT_CHART, row).rowcount
                 except Exception:
-                    skipped += 1
-            conn.commit()
-        finally:
-            conn.close()
+                    pass
+        conn.commit()
 
+    skipped = len(payload.charts) - imported
     return {"imported": imported, "skipped": skipped}
 
 
 @app.post("/api/match", response_model=MatchResponse)
-async def match_kundalis(request: MatchRequest):
+def match_kundalis(request: MatchRequest):
     try:
         # Generate charts
-        ay1 = AYANAMSHA_MAP.get((request.person1.ayanamsha or "lahiri").lower(), swe.SIDM_LAHIRI)
-        ay2 = AYANAMSHA_MAP.get((request.person2.ayanamsha or "lahiri").lower(), swe.SIDM_LAHIRI)
+        ay1 = _resolve_ayanamsha(request.person1.ayanamsha)
+        ay2 = _resolve_ayanamsha(request.person2.ayanamsha)
 
         b1 = BirthInput(
             year=request.person1.year,
@@ -946,7 +1107,7 @@ async def match_kundalis(request: MatchRequest):
             longitude=request.person1.longitude,
             ephe_path=EPHE_PATH,
             ayanamsha=ay1,
-            use_utc=request.person1.use_utc or False,
+            use_utc=bool(request.person1.use_utc),
         )
 
         b2 = BirthInput(
@@ -961,7 +1122,7 @@ async def match_kundalis(request: MatchRequest):
             longitude=request.person2.longitude,
             ephe_path=EPHE_PATH,
             ayanamsha=ay2,
-            use_utc=request.person2.use_utc or False,
+            use_utc=bool(request.person2.use_utc),
         )
 
         chart1 = kundali(b1)
@@ -985,98 +1146,49 @@ async def match_kundalis(request: MatchRequest):
 
 
 
+def _bala_totals(balas: Dict[Any, Any], key: Any) -> Tuple[Dict[str, float], float]:
+    """Per-entry totals in Rupas (rounded) and their unrounded sum."""
+    totals = {}
+    total = 0.0
+    for name, bala in balas.items():
+        val_rupas = (
+            bala.get('total_rupas')
+            if isinstance(bala, dict) and bala.get('total_rupas') is not None
+            else (
+                (bala.get('total_shashtiamsas', 0.0) / 60.0)
+                if isinstance(bala, dict)
+                else 0.0
+            )
+        )
+        totals[key(name)] = round(val_rupas, 2)
+        total += val_rupas
+    return totals, total
+
+
 @app.post("/api/bala-calculator")
-async def calculate_bala_range(request: BalaCalculatorRequest):
+def calculate_bala_range(request: BalaCalculatorRequest):
     """Calculate Shad Bala and Bhava Bala for each hour in a given year range."""
     try:
-        ayanamsha_code = AYANAMSHA_MAP.get(request.ayanamsha.lower(), swe.SIDM_LAHIRI)
+        ayanamsha_code = _resolve_ayanamsha(request.ayanamsha)
         results = []
         
         start_date = datetime(request.start_year, 1, 1)
         end_date = datetime(request.end_year, 12, 31, 23, 59, 59)
+
+        # Every hour of the day, or once per day at noon (reported at midnight)
+        hours = range(0, 24) if request.include_hours else (12,)
+        one_day = timedelta(days=1)
         
         current_date = start_date
-        total_hours = 0
-        
         while current_date <= end_date:
-            if request.include_hours:
-                # Calculate for every hour of the day
-                for hour in range(0, 24, 1):
-                    try:
-                        birth_input = BirthInput(
-                            year=current_date.year,
-                            month=current_date.month,
-                            day=current_date.day,
-                            hour=hour,
-                            minute=0,
-                            second=0,
-                            tz_offset_hours=request.tz_offset_hours,
-                            latitude=request.latitude,
-                            longitude=request.longitude,
-                            ephe_path=EPHE_PATH,
-                            ayanamsha=ayanamsha_code
-                        )
-                        
-                        result = kundali(birth_input)
-                        
-                        # Extract Shad Bala totals (use Rupas if available)
-                        shad_bala_totals = {}
-                        total_shad_bala = 0.0
-                        for planet, bala in result.get('shad_bala', {}).items():
-                            val_rupas = (
-                                bala.get('total_rupas')
-                                if isinstance(bala, dict) and bala.get('total_rupas') is not None
-                                else (
-                                    (bala.get('total_shashtiamsas', 0.0) / 60.0)
-                                    if isinstance(bala, dict)
-                                    else 0.0
-                                )
-                            )
-                            shad_bala_totals[planet] = round(val_rupas, 2)
-                            total_shad_bala += val_rupas
-                        
-                        # Extract Bhava Bala totals (use Rupas if available)
-                        bhava_bala_totals = {}
-                        total_bhava_bala = 0.0
-                        for house, bala in result.get('bhava_bala', {}).items():
-                            val_rupas = (
-                                bala.get('total_rupas')
-                                if isinstance(bala, dict) and bala.get('total_rupas') is not None
-                                else (
-                                    (bala.get('total_shashtiamsas', 0.0) / 60.0)
-                                    if isinstance(bala, dict)
-                                    else 0.0
-                                )
-                            )
-                            bhava_bala_totals[f"House_{house}"] = round(val_rupas, 2)
-                            total_bhava_bala += val_rupas
-                        
-                        results.append({
-                            "datetime": current_date.replace(hour=hour).isoformat(),
-                            "shad_bala": {
-                                "totals": shad_bala_totals,
-                                "total": total_shad_bala
-                            },
-                            "bhava_bala": {
-                                "totals": bhava_bala_totals,
-                                "total": total_bhava_bala
-                            }
-                        })
-                        
-                        total_hours += 1
-                        
-                                                    
-                    except Exception as e:
-                        # Skip problematic hours but continue
-                        continue
-            else:
-                # Calculate only once per day (noon)
+            year, month, day = current_date.year, current_date.month, current_date.day
+            for hour in hours:
                 try:
                     birth_input = BirthInput(
-                        year=current_date.year,
-                        month=current_date.month,
-                        day=current_date.day,
-                        hour=12,
+                        year=year,
+                        month=month,
+                        day=day,
+                        hour=hour,
                         minute=0,
                         second=0,
                         tz_offset_hours=request.tz_offset_hours,
@@ -1086,42 +1198,19 @@ async def calculate_bala_range(request: BalaCalculatorRequest):
                         ayanamsha=ayanamsha_code
                     )
                     
-                    result = kundali(birth_input)
+                    # Only the Bala sections are needed, so skip the full chart
+                    # (and keep the sweep out of kundali()'s cache)
+                    result = kundali_bala(birth_input)
                     
-                    # Extract Shad Bala totals (use Rupas if available)
-                    shad_bala_totals = {}
-                    total_shad_bala = 0.0
-                    for planet, bala in result.get('shad_bala', {}).items():
-                        val_rupas = (
-                            bala.get('total_rupas')
-                            if isinstance(bala, dict) and bala.get('total_rupas') is not None
-                            else (
-                                (bala.get('total_shashtiamsas', 0.0) / 60.0)
-                                if isinstance(bala, dict)
-                                else 0.0
-                            )
-                        )
-                        shad_bala_totals[planet] = round(val_rupas, 2)
-                        total_shad_bala += val_rupas
-                    
-                    # Extract Bhava Bala totals (use Rupas if available)
-                    bhava_bala_totals = {}
-                    total_bhava_bala = 0.0
-                    for house, bala in result.get('bhava_bala', {}).items():
-                        val_rupas = (
-                            bala.get('total_rupas')
-                            if isinstance(bala, dict) and bala.get('total_rupas') is not None
-                            else (
-                                (bala.get('total_shashtiamsas', 0.0) / 60.0)
-                                if isinstance(bala, dict)
-                                else 0.0
-                            )
-                        )
-                        bhava_bala_totals[f"House_{house}"] = round(val_rupas, 2)
-                        total_bhava_bala += val_rupas
+                    shad_bala_totals, total_shad_bala = _bala_totals(result['shad_bala'], str)
+                    bhava_bala_totals, total_bhava_bala = _bala_totals(
+                        result['bhava_bala'], lambda house: f"House_{house}"
+                    )
                     
                     results.append({
-                        "datetime": current_date.isoformat(),
+                        "datetime": (
+                            current_date.replace(hour=hour) if request.include_hours else current_date
+                        ).isoformat(),
                         "shad_bala": {
                             "totals": shad_bala_totals,
                             "total": total_shad_bala
@@ -1131,12 +1220,11 @@ async def calculate_bala_range(request: BalaCalculatorRequest):
                             "total": total_bhava_bala
                         }
                     })
-                    
-                except Exception as e:
-                    # Skip problematic days but continue
-                    pass
+                except Exception:
+                    # Skip problematic hours/days but continue
+                    continue
             
-            current_date += timedelta(days=1)
+            current_date += one_day
         
         return {
             "request_params": {
@@ -1168,7 +1256,7 @@ class TimeConvertRequest(BaseModel):
 
 
 @app.post("/api/convert-time")
-async def convert_time(request: TimeConvertRequest):
+def convert_time(request: TimeConvertRequest):
     """Convert time between local and UTC."""
     try:
         if request.direction == "to_utc":
@@ -1261,7 +1349,7 @@ async def geocode(query: str):
 
 
 @app.get("/api/reverse-geocode", response_model=ReverseGeocodeResponse)
-async def reverse_geocode(lat: float, lon: float):
+def reverse_geocode(lat: float, lon: float):
     """Reverse geocode coordinates using Nominatim.
 
     Done on backend to avoid browser CORS and improve reliability.
@@ -1902,7 +1990,7 @@ def _build_astro_response(message: str, insights: dict, chart_name: str) -> str:
 
 
 @app.post("/api/chat")
-async def astro_chat(request: ChatRequest):
+def astro_chat(request: ChatRequest):
     """AI Astrologer chat endpoint using OpenRouter with tool-calling."""
     try:
         if not request.kundali_data: